@@ -2,16 +2,24 @@
 Flask Web Application for AI-Powered Guessing Game
 Modern, responsive web interface with real-time interactions
 """
-from flask import Flask, render_template, jsonify, request, session
+from flask import Flask, Response, g, render_template, request, session
 import os
 import secrets
+import functools
+import gzip
 import json
 import random
+import re
+import threading
 import time
-import uuid
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
+import cachetools.func
+from cachetools import TTLCache
+import orjson
 
 # Import game modules  
 from cloud_scoring import CloudScoreKeeper
@@ -21,7 +29,9 @@ from postgresql_db import PostgreSQLHandler
 from openai import AzureOpenAI
 from azure.identity import DefaultAzureCredential
 from dotenv import load_dotenv
-import jellyfish
+from rapidfuzz import process
+from rapidfuzz.distance import JaroWinkler
+from rapidfuzz.utils import default_process
 
 # Load environment variables
 load_dotenv()
@@ -30,6 +40,14 @@ load_dotenv()
 CATEGORIES_FILE = "categories.json"
 NO_ACTIVE_SESSION_ERROR = "No active game session"
 ENCODING_UTF8 = "utf-8"
+RECENT_ITEMS_LIMIT = 30  # Recent items fed to the AI prompt to avoid duplicates
+AVOID_ITEMS_PROMPT_LIMIT = 15  # Items listed in the prompt, kept short to avoid token limits
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a creative assistant that generates unique and engaging guessing game content. Always prioritize originality and avoid repetition. Be creative and think outside the box."
+}
+GZIP_MIN_BYTES = 1024  # Smaller JSON bodies are sent uncompressed; gzip overhead outweighs the savings
+CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.S)  # JSON inside a markdown code fence
 
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
@@ -39,11 +57,21 @@ logger.setLevel(logging.WARNING)
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', secrets.token_hex(32))
 
-# Initialize game components
-score_keeper = CloudScoreKeeper()
+# Initialize game components (one PostgreSQL handler, and so one connection pool, per process)
+db_handler = PostgreSQLHandler()
+score_keeper = CloudScoreKeeper(db_handler)
 lang_manager = LanguageManager()
 scoring_system = ScoringSystem()
-db_handler = PostgreSQLHandler()
+
+@cachetools.func.ttl_cache(maxsize=256, ttl=30)
+def _recent_items(category, subcategory):
+    """Recent items for a category, cached briefly since the lookback window is 48 hours."""
+    return tuple(db_handler.get_recent_items_for_category(
+        category=category, 
+        subcategory=subcategory,
+        hours_back=48,  # Look back 48 hours
+        limit=RECENT_ITEMS_LIMIT  # Limit to prevent prompt bloat
+    ))
 
 # Game classes from console version
 class GameCategoryManager:
@@ -53,17 +81,22 @@ class GameCategoryManager:
         """Initialize the category manager with categories from JSON file."""
         self.categories = []
         self.lang_manager = lang_manager
-        self.generated_items = set()  # Track generated items to avoid duplicates
+        self.generated_items = deque(maxlen=RECENT_ITEMS_LIMIT)  # Recently generated items (bounded) to avoid duplicates
         self.category_usage_count = {}  # Track how many times each category/subcategory is used
+        self._localized_cache = {}  # (category name, language) -> localized category
+        self._rng = random.Random()  # Per-instance generator for hint and category picks
         self.load_categories(categories_file)
         self.init_polish_translations()
 
     def load_categories(self, filename):
         """Load categories from JSON file."""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filename, 'rb') as f:
+                data = orjson.loads(f.read())
                 self.categories = data.get('categories', [])
+                # Index by lowercased name so lookups don't rescan the list
+                self._by_name_lower = {cat['name'].lower(): cat for cat in self.categories}
+                self._category_names = tuple(cat['name'] for cat in self.categories)
         except FileNotFoundError:
             # If categories file is missing, this is a critical error
             # The application cannot function without categories
@@ -75,8 +108,8 @@ class GameCategoryManager:
     def init_polish_translations(self):
         """Initialize Polish translations for categories."""
         try:
-            with open('category_translations.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open('category_translations.json', 'rb') as f:
+                data = orjson.loads(f.read())
                 self.polish_translations = data.get('category_translations', {}).get('pl', {})
         except FileNotFoundError:
             # If translations file is missing, log warning but continue with empty translations
@@ -86,13 +119,17 @@ class GameCategoryManager:
         except json.JSONDecodeError as e:
             logging.error(f"Invalid JSON in category_translations.json: {e}")
             self.polish_translations = {}
+        
+        # Index categories by lowercased Polish name as well
+        self._by_polish_lower = {
+            translation['name'].lower(): self._by_name_lower[name.lower()]
+            for name, translation in self.polish_translations.items()
+            if name.lower() in self._by_name_lower
+        }
 
     def find_category(self, name):
         """Find a category by name."""
-        for cat in self.categories:
-            if cat['name'].lower() == name.lower():
-                return cat
-        return None
+        return self._by_name_lower.get(name.lower())
 
     def get_category_hint(self, category_name):
         """Get a smart subcategory hint that avoids recently used ones."""
@@ -102,7 +139,7 @@ class GameCategoryManager:
         
         # Track usage for this category
         if category_name not in self.category_usage_count:
-            self.category_usage_count[category_name] = {}
+            self.category_usage_count[category_name] = Counter()
         
         examples = category['examples']
         usage_counts = self.category_usage_count[category_name]
@@ -110,38 +147,49 @@ class GameCategoryManager:
         # If we haven't used all examples yet, prefer unused ones
         unused_examples = [ex for ex in examples if ex not in usage_counts]
         if unused_examples:
-            chosen_hint = random.choice(unused_examples)
+            chosen_hint = self._rng.choice(unused_examples)
         else:
             # All examples have been used, choose the least used one
+            # (single pass with reservoir sampling to break ties randomly)
             min_usage = min(usage_counts.values())
-            least_used = [ex for ex, count in usage_counts.items() if count == min_usage]
-            chosen_hint = random.choice(least_used)
+            chosen_hint = None
+            ties = 0
+            for ex, count in usage_counts.items():
+                if count == min_usage:
+                    ties += 1
+                    if self._rng.random() * ties < 1:
+                        chosen_hint = ex
         
         # Update usage count
-        usage_counts[chosen_hint] = usage_counts.get(chosen_hint, 0) + 1
+        usage_counts[chosen_hint] += 1
         
         return self.get_localized_hint(chosen_hint)
 
     def get_localized_hint(self, english_hint):
         """Get localized version of a subcategory hint."""
-        if not self.lang_manager or self.lang_manager.current_language == 'en':
+        if not self.lang_manager or self.lang_manager.is_english:
             return english_hint
         return self.lang_manager.translate_category_example(english_hint)
 
     def get_random_category(self):
         """Get a random category."""
-        return random.choice(self.categories) if self.categories else None
+        return self._rng.choice(self.categories) if self.categories else None
 
     def get_localized_category(self, category):
         """Get category with localized name and description."""
-        if not self.lang_manager or self.lang_manager.current_language == 'en':
+        if not self.lang_manager or self.lang_manager.is_english:
             return category
         
         category_name = category['name']
-        if category_name in self.polish_translations:
+        cache_key = (category_name, self.lang_manager.current_language)
+        if cache_key in self._localized_cache:
+            return self._localized_cache[cache_key]
+        
+        translation = self.polish_translations.get(category_name)
+        if translation:
             localized = {
-                'name': self.polish_translations[category_name]['name'],
-                'description': self.polish_translations[category_name]['description'],
+                'name': translation['name'],
+                'description': translation['description'],
                 'original_name': category_name,  # Keep original for AI prompts
                 'examples': []
             }
@@ -151,69 +199,68 @@ class GameCategoryManager:
                 translated_example = self.lang_manager.translate_category_example(example)
                 localized['examples'].append(translated_example)
             
+            self._localized_cache[cache_key] = localized
             return localized
         
+        self._localized_cache[cache_key] = category
         return category
 
     def get_category_names(self):
-        """Get list of available category names."""
-        return [cat['name'] for cat in self.categories]
+        """Get available category names (an immutable tuple cached at load time)."""
+        return self._category_names
 
     def find_category_by_any_name(self, name):
         """Find a category by English or Polish name."""
         name_lower = name.lower()
         
         # First try English names
-        for cat in self.categories:
-            if cat['name'].lower() == name_lower:
-                return cat
+        category = self._by_name_lower.get(name_lower)
+        if category:
+            return category
         
         # Then try Polish names
         if self.lang_manager and self.lang_manager.current_language == 'pl':
-            for cat in self.categories:
-                if cat['name'] in self.polish_translations:
-                    polish_name = self.polish_translations[cat['name']]['name']
-                    if polish_name.lower() == name_lower:
-                        return cat
+            return self._by_polish_lower.get(name_lower)
         
         return None
 
+    def get_localized_category_name(self, category_name, language):
+        """Get the category name in the given language without touching lang_manager state."""
+        category = self.find_category(category_name)
+        if not category:
+            return category_name
+        translation = self.polish_translations.get(category['name']) if language == 'pl' else None
+        return translation['name'] if translation else category['name']
+
     def get_category_display_name(self, category):
         """Get the display name for a category in current language."""
-        if not self.lang_manager or self.lang_manager.current_language == 'en':
+        if not self.lang_manager or self.lang_manager.is_english:
             return category['name']
         
-        if category['name'] in self.polish_translations:
-            return self.polish_translations[category['name']]['name']
-        
-        return category['name']
+        translation = self.polish_translations.get(category['name'])
+        return translation['name'] if translation else category['name']
 
     def get_category_display_description(self, category):
         """Get the display description for a category in current language."""
-        if not self.lang_manager or self.lang_manager.current_language == 'en':
+        if not self.lang_manager or self.lang_manager.is_english:
             return category['description']
         
-        if category['name'] in self.polish_translations:
-            return self.polish_translations[category['name']]['description']
-        
-        return category['description']
+        translation = self.polish_translations.get(category['name'])
+        return translation['description'] if translation else category['description']
 
     def add_generated_item(self, item_name):
         """Track a generated item to avoid duplicates."""
-        self.generated_items.add(item_name.lower())
-        logger.info(f"Added '{item_name}' to generated items list. Total unique items: {len(self.generated_items)}")
+        item_lower = item_name.lower()
+        if item_lower not in self.generated_items:
+            self.generated_items.append(item_lower)
+        logger.info(f"Added '{item_name}' to generated items list. Tracking {len(self.generated_items)} recent items")
     
     def get_generated_items_for_category(self, category_name, subcategory=None):
         """Get list of recently generated items for a category to help AI avoid duplicates."""
         # Use database to get recent items instead of local memory for better accuracy
         try:
             if db_handler and db_handler.is_connected():
-                return db_handler.get_recent_items_for_category(
-                    category=category_name, 
-                    subcategory=subcategory,
-                    hours_back=48,  # Look back 48 hours
-                    limit=30       # Limit to prevent prompt bloat
-                )
+                return list(_recent_items(category_name, subcategory))
         except Exception as e:
             logger.warning(f"Failed to get recent items from database: {e}")
         
@@ -229,9 +276,38 @@ class GameCategoryManager:
 class AnswerChecker:
     """Handles answer checking with fuzzy matching using Jaro-Winkler algorithm."""
     
+    # Feedback per language: correct answers by match type, misses by similarity tier (descending)
+    _FEEDBACK_EN = {
+        "exact": "🎉 Correct! Perfect match!",
+        "similar": "🎉 Correct! Close enough! ({similarity:.1%} similar)",
+        "tiers": (
+            (0.7, "🔥 Very close! ({similarity:.1%} similar) - Try again!"),
+            (0.5, "🌟 Getting warmer! ({similarity:.1%} similar) - Keep trying!"),
+            (0.0, "❌ Not quite right - Try again!"),
+        ),
+    }
+    _FEEDBACK_PL = {
+        "exact": "🎉 Poprawnie! Idealne dopasowanie!",
+        "similar": "🎉 Poprawnie! Wystarczająco blisko! ({similarity:.1%} podobne)",
+        "tiers": (
+            (0.7, "🔥 Bardzo blisko! ({similarity:.1%} podobne) - Spróbuj ponownie!"),
+            (0.5, "🌟 Robi się cieplej! ({similarity:.1%} podobne) - Próbuj dalej!"),
+            (0.0, "❌ Nie całkiem - Spróbuj ponownie!"),
+        ),
+    }
+    
     def __init__(self, similarity_threshold=0.9):
         """Initialize with similarity threshold (0.9 = 90% similar)."""
         self.similarity_threshold = similarity_threshold
+        self._answer_raw = None
+        self._answer_lower = None
+        self._answer_clean = None
+
+    def set_answer(self, correct_answer):
+        """Normalize the round's answer once so each guess only cleans the guess."""
+        self._answer_raw = correct_answer
+        self._answer_lower = correct_answer.strip().lower() if correct_answer else None
+        self._answer_clean = default_process(correct_answer) if correct_answer else None
 
     def is_correct_answer(self, guess, correct_answer):
         """
@@ -247,50 +323,77 @@ class AnswerChecker:
         if not guess or not correct_answer:
             return False, 0.0, "invalid"
         
-        # Clean inputs
-        guess_clean = guess.strip().lower()
-        answer_clean = correct_answer.strip().lower()
+        if correct_answer != self._answer_raw:
+            self.set_answer(correct_answer)
+        return self.check_guess(guess)
+
+    def check_guess(self, guess):
+        """
+        Check a guess against the answer fixed by set_answer, without re-checking the answer.
+        
+        Args:
+            guess (str): The player's guess
+            
+        Returns:
+            tuple: (is_correct, similarity_score, match_type)
+        """
+        # Typed exactly (ignoring case and outer whitespace): no cleaning or fuzzy scoring needed
+        if guess and self._answer_lower and guess.strip().lower() == self._answer_lower:
+            return True, 1.0, "exact"
+        
+        # Clean the guess (lowercase, trim, punctuation -> spaces) in a single C pass
+        guess_clean = default_process(guess) if guess else ""
+        answer_clean = self._answer_clean
+        if not guess_clean or not answer_clean:
+            return False, 0.0, "invalid"
         
         # Exact match
         if guess_clean == answer_clean:
             return True, 1.0, "exact"
         
-        # Jaro-Winkler similarity
-        similarity = jellyfish.jaro_winkler_similarity(guess_clean, answer_clean)
+        # Jaro-Winkler similarity (no score_cutoff: the raw score drives the "warmer" feedback tiers)
+        similarity = JaroWinkler.normalized_similarity(guess_clean, answer_clean)
         
         if similarity >= self.similarity_threshold:
             return True, similarity, "similar"
         
         return False, similarity, "different"
 
-    def get_feedback(self, guess, correct_answer, lang_manager=None):
-        """Get feedback message for the guess."""
-        _, similarity, match_type = self.is_correct_answer(guess, correct_answer)
+    def is_correct_answer_batch(self, guess, answers):
+        """
+        Check a guess against several accepted answers (e.g. aliases) in one call.
         
-        if lang_manager and lang_manager.current_language == 'pl':
-            # Polish feedback
-            if match_type == "exact":
-                return "🎉 Poprawnie! Idealne dopasowanie!"
-            elif match_type == "similar":
-                return f"🎉 Poprawnie! Wystarczająco blisko! ({similarity:.1%} podobne)"
-            elif similarity >= 0.7:
-                return f"🔥 Bardzo blisko! ({similarity:.1%} podobne) - Spróbuj ponownie!"
-            elif similarity >= 0.5:
-                return f"🌟 Robi się cieplej! ({similarity:.1%} podobne) - Próbuj dalej!"
-            else:
-                return "❌ Nie całkiem - Spróbuj ponownie!"
-        else:
-            # English feedback
-            if match_type == "exact":
-                return "🎉 Correct! Perfect match!"
-            elif match_type == "similar":
-                return f"🎉 Correct! Close enough! ({similarity:.1%} similar)"
-            elif similarity >= 0.7:
-                return f"🔥 Very close! ({similarity:.1%} similar) - Try again!"
-            elif similarity >= 0.5:
-                return f"🌟 Getting warmer! ({similarity:.1%} similar) - Keep trying!"
-            else:
-                return "❌ Not quite right - Try again!"
+        Args:
+            guess (str): The player's guess
+            answers (list[str]): Accepted answers
+            
+        Returns:
+            tuple: (is_correct, similarity_score, match_type) for the best-matching answer
+        """
+        answers_clean = [default_process(answer) for answer in answers if answer]
+        guess_clean = default_process(guess) if guess else ""
+        if not guess_clean or not answers_clean:
+            return False, 0.0, "invalid"
+        
+        if guess_clean in answers_clean:
+            return True, 1.0, "exact"
+        
+        _, similarity, _ = process.extractOne(
+            guess_clean, answers_clean, scorer=JaroWinkler.normalized_similarity
+        )
+        
+        if similarity >= self.similarity_threshold:
+            return True, similarity, "similar"
+        
+        return False, similarity, "different"
+
+    def get_feedback(self, similarity, match_type, lang='en'):
+        """Get feedback message for a guess already scored by is_correct_answer."""
+        table = self._FEEDBACK_PL if lang == 'pl' else self._FEEDBACK_EN
+        template = table.get(match_type) or next(
+            tmpl for threshold, tmpl in table["tiers"] if similarity >= threshold
+        )
+        return template.format(similarity=similarity)
 
 class AzureOpenAIGameEngine:
     """Game engine that uses Azure OpenAI to generate random items and facts."""
@@ -357,7 +460,7 @@ class AzureOpenAIGameEngine:
                     
                     item = self._parse_openai_response(response)
                     
-                    if self._is_duplicate_item(item['name'], category_hint, lang_manager, attempt, max_attempts):
+                    if self._is_duplicate_item(item['name'], category_hint, lang_manager, attempt, max_attempts, avoid_items):
                         avoid_items.append(item['name'])
                         continue
                     
@@ -395,10 +498,11 @@ class AzureOpenAIGameEngine:
             return self._get_fallback_item(lang_manager)
     
     def _get_avoid_items(self, category_manager, category_hint, subcategory_hint):
-        """Get list of items to avoid based on recent generation."""
+        """Get the most recent items to avoid, bounded to what the prompt will show."""
         if category_manager:
-            return category_manager.get_generated_items_for_category(category_hint, subcategory_hint)
-        return []
+            recent_items = category_manager.get_generated_items_for_category(category_hint, subcategory_hint)
+            return deque(recent_items, maxlen=AVOID_ITEMS_PROMPT_LIMIT)
+        return deque(maxlen=AVOID_ITEMS_PROMPT_LIMIT)
     
     def _build_generation_prompt(self, category_hint, subcategory_hint, lang_manager, 
                                difficulty, avoid_items, attempt):
@@ -406,12 +510,12 @@ class AzureOpenAIGameEngine:
         if lang_manager:
             return lang_manager.get_localized_prompt(category_hint, subcategory_hint)
         
-        prompt = self._build_base_english_prompt(category_hint, subcategory_hint)
-        prompt = self._add_avoidance_context(prompt, avoid_items)
-        prompt = self._add_difficulty_context(prompt, difficulty)
-        prompt = self._add_retry_context(prompt, attempt)
-        
-        return prompt
+        return "\n\n".join(filter(None, [
+            self._build_base_english_prompt(category_hint, subcategory_hint),
+            self._avoidance_context(avoid_items),
+            self._difficulty_context(difficulty),
+            self._retry_context(attempt),
+        ]))
     
     def _build_base_english_prompt(self, category_hint, subcategory_hint):
         """Build the base English prompt template."""
@@ -443,25 +547,25 @@ Rules:
 - Use descriptions, characteristics, and context instead of direct names
 - BE CREATIVE AND UNIQUE - avoid common or obvious choices"""
     
-    def _add_avoidance_context(self, prompt, avoid_items):
-        """Add context about items to avoid."""
+    def _avoidance_context(self, avoid_items):
+        """Return the prompt fragment about items to avoid, if any."""
         if avoid_items:
-            avoid_list = ", ".join(avoid_items[-15:])  # Show last 15 to avoid token limits
-            prompt += f"\n\nIMPORTANT: Do NOT generate any of these recently used items: {avoid_list}"
-            prompt += "\nChoose something completely different, unique, and creative."
-        return prompt
+            avoid_list = ", ".join(avoid_items)
+            return (f"IMPORTANT: Do NOT generate any of these recently used items: {avoid_list}\n"
+                    "Choose something completely different, unique, and creative.")
+        return None
     
-    def _add_difficulty_context(self, prompt, difficulty):
-        """Add difficulty-specific context to prompt."""
+    def _difficulty_context(self, difficulty):
+        """Return the difficulty-specific prompt fragment, if any."""
         if difficulty:
-            prompt += f"\n\nDifficulty guideline: {difficulty.get('prompt_hint', '')}"
-        return prompt
+            return f"Difficulty guideline: {difficulty.get('prompt_hint', '')}"
+        return None
     
-    def _add_retry_context(self, prompt, attempt):
-        """Add retry-specific context for better uniqueness."""
+    def _retry_context(self, attempt):
+        """Return the retry prompt fragment for better uniqueness, if any."""
         if attempt > 0:
-            prompt += f"\n\nATTEMPT {attempt + 1}: This is a retry. Please be even MORE creative and unique. Avoid obvious choices!"
-        return prompt
+            return f"ATTEMPT {attempt + 1}: This is a retry. Please be even MORE creative and unique. Avoid obvious choices!"
+        return None
     
     def _call_openai_api(self, prompt, attempt):
         """Make the API call to OpenAI."""
@@ -470,10 +574,7 @@ Rules:
         
         return self.client.chat.completions.create(
             model=self.deployment_name or "gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a creative assistant that generates unique and engaging guessing game content. Always prioritize originality and avoid repetition. Be creative and think outside the box."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=[_SYSTEM_MSG, {"role": "user", "content": prompt}],
             max_tokens=500,
             temperature=min(0.9 + (attempt * 0.1), 1.0),  # Increase temperature on retries
             timeout=30
@@ -486,15 +587,11 @@ Rules:
         if content is None:
             raise ValueError("Empty response from Azure OpenAI")
         
-        content = content.strip()
-        
         # Extract JSON from the response
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        match = CODE_FENCE_RE.search(content)
+        payload = match.group(1) if match else content
         
-        item = json.loads(content)
+        item = orjson.loads(payload)
         
         # Validate the response format
         if not isinstance(item, dict) or 'name' not in item or 'facts' not in item:
@@ -505,17 +602,22 @@ Rules:
         
         return item
     
-    def _is_duplicate_item(self, item_name, category_hint, lang_manager, attempt, max_attempts):
+    def _is_duplicate_item(self, item_name, category_hint, lang_manager, attempt, max_attempts, avoid_items=()):
         """Check if the generated item is a duplicate."""
         language = lang_manager.current_language if lang_manager else 'en'
         
-        if db_handler and db_handler.is_connected():
-            if db_handler.check_item_exists(item_name, category_hint, language, time_window_hours=72):
-                logger.warning(f"Duplicate item '{item_name}' detected in attempt {attempt + 1}, retrying...")
-                if attempt < max_attempts - 1:
-                    return True
-                else:
-                    logger.warning(f"Max attempts reached, accepting potentially duplicate item: {item_name}")
+        # The avoid list was already fetched in one query, so check it before asking the database
+        item_lower = item_name.lower()
+        is_duplicate = any(item_lower == avoided.lower() for avoided in avoid_items)
+        if not is_duplicate and db_handler and db_handler.is_connected():
+            is_duplicate = db_handler.check_item_exists(item_name, category_hint, language, time_window_hours=72)
+        
+        if is_duplicate:
+            logger.warning(f"Duplicate item '{item_name}' detected in attempt {attempt + 1}, retrying...")
+            if attempt < max_attempts - 1:
+                return True
+            else:
+                logger.warning(f"Max attempts reached, accepting potentially duplicate item: {item_name}")
         
         return False
     
@@ -530,15 +632,10 @@ Rules:
         try:
             language = lang_manager.current_language if lang_manager else 'en'
             
-            # Get localized category name for storage
+            # Get localized category name for storage (shared manager, no per-call file reloads)
             localized_category = category_hint
-            if lang_manager and lang_manager.current_language != 'en':
-                # Create a category manager to get localized category name
-                category_manager = GameCategoryManager(lang_manager=lang_manager)
-                category_obj = category_manager.find_category(category_hint)
-                if category_obj:
-                    localized_category_obj = category_manager.get_localized_category(category_obj)
-                    localized_category = localized_category_obj['name']
+            if category_hint and language != 'en':
+                localized_category = category_manager.get_localized_category_name(category_hint, language)
             
             question_data = {
                 'item_name': item['name'],
@@ -601,91 +698,90 @@ Rules:
             language = lang_manager.current_language if lang_manager else 'en'
             
             # Try to get a random question from the database for this category and language
-            with db_handler.connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT item_name, facts, category, subcategory
-                    FROM generated_questions 
-                    WHERE LOWER(category) = LOWER(%s) 
-                    AND language = %s 
-                    ORDER BY RANDOM() 
-                    LIMIT 1
-                """, (category_hint, language))
-                
-                result = cursor.fetchone()
-                if result:
-                    return {
-                        "name": result[0],
-                        "facts": result[1] if isinstance(result[1], list) else [str(result[1])],
-                        "category": result[2],
-                        "subcategory": result[3],
-                        "from_database": True
-                    }
+            result = db_handler.get_random_question_for_category(category_hint, language)
+            if result:
+                facts = result['facts']
+                return {
+                    "name": result['item_name'],
+                    "facts": facts if isinstance(facts, list) else [str(facts)],
+                    "category": result['category'],
+                    "subcategory": result['subcategory'],
+                    "from_database": True
+                }
         except Exception as e:
             logger.error(f"Failed to retrieve question from database: {e}")
             
         return None
 
+@functools.cache
+def _load_difficulty_levels():
+    """Load difficulty levels from JSON file (parsed once per process)."""
+    try:
+        with open('difficulty_levels.json', 'rb') as f:
+            data = orjson.loads(f.read())
+            levels_data = data.get('difficulty_levels', {})
+    except FileNotFoundError:
+        # Fallback levels if file not found
+        levels_data = {
+            'very_easy': {
+                'name': 'very_easy',
+                'score_multiplier': 0.8,
+                'pl_name': 'bardzo łatwy',
+                'pl_desc': 'Najłatwiejsze zagadki z oczywistymi wskazówkami, zmniejszone punktowanie',
+                'en_desc': 'Easiest puzzles with very obvious clues, reduced scoring',
+                'prompt_hint': 'Make the facts extremely obvious and straightforward, with very clear hints from the beginning. Perfect for children or absolute beginners.'
+            },
+            'easy': {
+                'name': 'easy',
+                'score_multiplier': 1.0,
+                'pl_name': 'łatwy',
+                'pl_desc': 'Prostsze zagadki, normalne punktowanie',
+                'en_desc': 'Simpler puzzles, normal scoring',
+                'prompt_hint': 'Make the facts very straightforward and obvious, suitable for beginners.'
+            },
+            'normal': {
+                'name': 'normal',
+                'score_multiplier': 1.2,
+                'pl_name': 'normalny',
+                'pl_desc': 'Standardowy poziom zagadek, zwiększone punktowanie',
+                'en_desc': 'Standard puzzle difficulty, increased scoring',
+                'prompt_hint': 'Balance the facts between obvious and subtle hints, suitable for average players.'
+            },
+            'hard': {
+                'name': 'hard',
+                'score_multiplier': 1.5,
+                'pl_name': 'trudny',
+                'pl_desc': 'Bardziej wymagające zagadki, znacznie zwiększone punktowanie',
+                'en_desc': 'More challenging puzzles, significantly increased scoring',
+                'prompt_hint': 'Make the facts more subtle and clever, requiring good deduction skills. Avoid very obvious hints until the final fact.'
+            },
+            'expert': {
+                'name': 'expert',
+                'score_multiplier': 2.0,
+                'pl_name': 'ekspert',
+                'pl_desc': 'Najtrudniejsze zagadki z zawoalowanymi wskazówkami, maksymalne punktowanie',
+                'en_desc': 'Hardest puzzles with cryptic clues, maximum scoring',
+                'prompt_hint': 'Make the facts very cryptic, abstract, and challenging. Use metaphors, indirect references, and require deep thinking. Only the final fact should be somewhat direct.'
+            }
+        }
+    
+    return levels_data
+
 class DifficultyLevel:
     """Manages game difficulty settings."""
     
     _levels = None  # Class variable to store loaded levels
+    _levels_tuple = ()  # Same levels as a tuple, so get_all_levels needs no copy
+    _levels_by_name = {}  # Level 'name' -> level, for get_level
+    _difficulties_json = {}  # Language code -> serialized /api/difficulties body
     
     @classmethod
     def _load_levels(cls):
-        """Load difficulty levels from JSON file."""
-        if cls._levels is not None:
-            return cls._levels
-            
-        try:
-            with open('difficulty_levels.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                levels_data = data.get('difficulty_levels', {})
-        except FileNotFoundError:
-            # Fallback levels if file not found
-            levels_data = {
-                'very_easy': {
-                    'name': 'very_easy',
-                    'score_multiplier': 0.8,
-                    'pl_name': 'bardzo łatwy',
-                    'pl_desc': 'Najłatwiejsze zagadki z oczywistymi wskazówkami, zmniejszone punktowanie',
-                    'en_desc': 'Easiest puzzles with very obvious clues, reduced scoring',
-                    'prompt_hint': 'Make the facts extremely obvious and straightforward, with very clear hints from the beginning. Perfect for children or absolute beginners.'
-                },
-                'easy': {
-                    'name': 'easy',
-                    'score_multiplier': 1.0,
-                    'pl_name': 'łatwy',
-                    'pl_desc': 'Prostsze zagadki, normalne punktowanie',
-                    'en_desc': 'Simpler puzzles, normal scoring',
-                    'prompt_hint': 'Make the facts very straightforward and obvious, suitable for beginners.'
-                },
-                'normal': {
-                    'name': 'normal',
-                    'score_multiplier': 1.2,
-                    'pl_name': 'normalny',
-                    'pl_desc': 'Standardowy poziom zagadek, zwiększone punktowanie',
-                    'en_desc': 'Standard puzzle difficulty, increased scoring',
-                    'prompt_hint': 'Balance the facts between obvious and subtle hints, suitable for average players.'
-                },
-                'hard': {
-                    'name': 'hard',
-                    'score_multiplier': 1.5,
-                    'pl_name': 'trudny',
-                    'pl_desc': 'Bardziej wymagające zagadki, znacznie zwiększone punktowanie',
-                    'en_desc': 'More challenging puzzles, significantly increased scoring',
-                    'prompt_hint': 'Make the facts more subtle and clever, requiring good deduction skills. Avoid very obvious hints until the final fact.'
-                },
-                'expert': {
-                    'name': 'expert',
-                    'score_multiplier': 2.0,
-                    'pl_name': 'ekspert',
-                    'pl_desc': 'Najtrudniejsze zagadki z zawoalowanymi wskazówkami, maksymalne punktowanie',
-                    'en_desc': 'Hardest puzzles with cryptic clues, maximum scoring',
-                    'prompt_hint': 'Make the facts very cryptic, abstract, and challenging. Use metaphors, indirect references, and require deep thinking. Only the final fact should be somewhat direct.'
-                }
-            }
-        
+        """Load difficulty levels and expose them as class attributes."""
+        levels_data = _load_difficulty_levels()
         cls._levels = levels_data
+        cls._levels_tuple = tuple(levels_data.values())
+        cls._levels_by_name = {level['name']: level for level in cls._levels_tuple if level}
         
         # Set class variables for backward compatibility
         cls.VERY_EASY = levels_data.get('very_easy')
@@ -705,26 +801,66 @@ class DifficultyLevel:
                 'prompt_hint': 'Balance the facts between obvious and subtle hints, suitable for average players.'
             }
         
+        # Levels never change after loading, so serialize the /api/difficulties bodies now
+        cls._difficulties_json = {
+            language: orjson.dumps(cls._build_display_list(language)) for language in ('en', 'pl')
+        }
+        
         return cls._levels
     
+    @classmethod
+    def _build_display_list(cls, language):
+        """Build the difficulty list with display names for the given language."""
+        difficulties = []
+        for level in cls._levels_tuple:
+            # Get localized names based on language parameter
+            if language == 'pl':
+                display_name = level['pl_name']
+                description = level['pl_desc']
+            else:
+                display_name = level['name'].replace('_', ' ').title()
+                description = level['en_desc']
+            
+            difficulties.append({
+                'name': level['name'],
+                'display_name': display_name,
+                'description': description,
+                'score_multiplier': level['score_multiplier']
+            })
+        return difficulties
+    
     @classmethod
     def get_level(cls, level_name):
         """Get a specific difficulty level by name."""
-        levels = cls._load_levels()
-        return levels.get(level_name)
+        return cls._levels_by_name.get(level_name)
     
     @classmethod
     def get_all_levels(cls):
-        """Get list of all difficulty levels."""
-        levels = cls._load_levels()
-        return list(levels.values())
+        """Get all difficulty levels (a shared tuple built at load time)."""
+        return cls._levels_tuple
 
 # Initialize the difficulty levels on import
 DifficultyLevel._load_levels()
 
+# Completed-round summary kept in WebGameSession.round_history
+RoundRecord = namedtuple(
+    'RoundRecord',
+    'category item_name facts_shown is_correct round_score time_taken_seconds guesses'
+)
+
 class WebGameSession:
     """Web-specific game session management"""
     
+    # Fixed attribute layout: no per-instance __dict__ for the many sessions held in active_sessions
+    __slots__ = (
+        'player_name', 'language', 'max_rounds', 'answer_checker', 'session_start_time',
+        'rounds', 'round_history', 'total_score', 'rounds_completed', 'rounds_won',
+        'total_facts_shown', 'total_time', 'last_round_end_time', '_dirty_rounds',
+        'current_category', 'current_item', 'current_facts', 'current_question_id', 'difficulty',
+        'facts_shown', 'guesses', 'round_start_time', 'failed_attempts', 'max_failed_attempts',
+        'hints_used', 'max_hints', '_hint_positions', '_hint_chars',
+    )
+    
     def __init__(self, player_name: str, language: str = 'en', max_rounds: Optional[int] = None):
         self.player_name = player_name
         self.language = language
@@ -739,15 +875,22 @@ class WebGameSession:
         self.failed_attempts = 0  # New: Track failed guess attempts
         self.max_failed_attempts = 3  # New: Maximum failed attempts before revealing answer
         self.round_start_time: Optional[datetime] = None
+        self.last_round_end_time: Optional[datetime] = None  # Reused as the session end time when saving
         self.rounds: List[GameRound] = []
         self.session_start_time = datetime.now()
         self.total_score = 0
         self.difficulty = DifficultyLevel.NORMAL
         self.answer_checker = AnswerChecker(similarity_threshold=0.90)
-        self.round_history: List = []  # Store completed rounds for database saving
+        self.round_history: List[RoundRecord] = []  # Store completed rounds for database saving
+        self._dirty_rounds = 0  # Rounds finished since the session was last saved
+        # Running totals over self.rounds, so session saves don't re-scan the round list
+        self.rounds_won = 0
+        self.total_facts_shown = 0
+        self.total_time = 0.0
         
         # Hint system
-        self.revealed_letters: set = set()  # Track revealed character positions
+        self._hint_positions: List[int] = []  # Unrevealed non-space positions, computed once per round
+        self._hint_chars: List[str] = []  # Current hint display, one entry per answer character
         self.hints_used = 0  # Track number of hints used in current round
         self.max_hints = 3  # Maximum hints per round
         
@@ -761,11 +904,13 @@ class WebGameSession:
         self.guesses = []
         self.failed_attempts = 0  # Reset failed attempts for new round
         self.round_start_time = datetime.now()
+        self.answer_checker.set_answer(item)
         if difficulty:
             self.difficulty = difficulty
         
         # Reset hint system for new round
-        self.revealed_letters.clear()
+        self._hint_positions = [i for i, char in enumerate(item) if not char.isspace()]
+        self._hint_chars = [char if char.isspace() else '_' for char in item]
         self.hints_used = 0
         
     def add_guess(self, guess: str) -> Dict:
@@ -778,8 +923,8 @@ class WebGameSession:
             
         self.guesses.append(guess)
         
-        # Use the proper answer checker with fuzzy matching
-        is_correct, similarity, match_type = self.answer_checker.is_correct_answer(guess, self.current_item)
+        # Use the proper answer checker with fuzzy matching (answer normalized in start_new_round)
+        is_correct, similarity, match_type = self.answer_checker.check_guess(guess)
         
         if is_correct:
             return self._end_round(True, similarity, match_type)
@@ -793,7 +938,8 @@ class WebGameSession:
                 return self._end_round(False, similarity, match_type, auto_revealed=True)
             
             # Get feedback message
-            feedback = self.answer_checker.get_feedback(guess, self.current_item, lang_manager)
+            language = lang_manager.current_language if lang_manager else 'en'
+            feedback = self.answer_checker.get_feedback(similarity, match_type, language)
             
             # Add attempt count to feedback
             attempts_remaining = self.max_failed_attempts - self.failed_attempts
@@ -831,22 +977,16 @@ class WebGameSession:
             else:
                 return {"success": False, "message": "All hints used for this round"}
         
-        # Get positions of characters to reveal (letters, digits, and special characters, but not spaces)
-        answer = self.current_item.lower()
-        char_positions = []
-        for i, char in enumerate(answer):
-            if not char.isspace() and i not in self.revealed_letters:
-                char_positions.append(i)
-        
-        if not char_positions:
+        # Positions of characters still to reveal (letters, digits, and special characters, but not spaces)
+        if not self._hint_positions:
             if lang_manager and lang_manager.current_language == 'pl':
                 return {"success": False, "message": "Nie ma więcej znaków do ujawnienia"}
             else:
                 return {"success": False, "message": "No more characters to reveal"}
         
         # Reveal a random character
-        position = random.choice(char_positions)
-        self.revealed_letters.add(position)
+        position = self._hint_positions.pop(random.randrange(len(self._hint_positions)))
+        self._hint_chars[position] = self.current_item[position].upper()
         self.hints_used += 1
         
         # Create hint display
@@ -872,22 +1012,12 @@ class WebGameSession:
         if not self.current_item:
             return ""
         
-        display = []
-        for i, char in enumerate(self.current_item):
-            if not char.isspace():  # All non-space characters can be revealed
-                if i in self.revealed_letters:
-                    display.append(char.upper())
-                else:
-                    display.append('_')
-            else:
-                # Keep spaces as is
-                display.append(char)
-        
-        return ''.join(display)
+        # get_hint patches each revealed character in place, so rendering is a single join
+        return ''.join(self._hint_chars)
     
     def get_current_hint_display(self) -> str:
         """Get the current hint display (for when switching between UI screens)"""
-        if not self.revealed_letters:
+        if not self.hints_used:
             return ""
         return self._create_hint_display()
     
@@ -896,7 +1026,8 @@ class WebGameSession:
         if not self.current_item or not self.current_category or not self.round_start_time:
             return {"correct": False, "message": "Invalid game state"}
             
-        time_taken = (datetime.now() - self.round_start_time).total_seconds()
+        self.last_round_end_time = datetime.now()
+        time_taken = (self.last_round_end_time - self.round_start_time).total_seconds()
         round_obj = self._create_game_round(correct, similarity, match_type, time_taken)
         
         if correct:
@@ -904,47 +1035,15 @@ class WebGameSession:
         
         self.rounds.append(round_obj)
         self.rounds_completed += 1
+        self._dirty_rounds += 1
+        if round_obj.correct:
+            self.rounds_won += 1
+        self.total_facts_shown += round_obj.facts_shown
+        self.total_time += round_obj.time_taken
         
-        # Save round to database immediately
-        self._save_round_to_database(round_obj, time_taken)
-        
-        feedback = self._get_round_feedback(auto_revealed)
+        feedback = self._get_round_feedback(auto_revealed, similarity, match_type)
         return self._build_round_result(correct, round_obj, time_taken, similarity, feedback, auto_revealed)
     
-    def _save_round_to_database(self, round_obj: GameRound, time_taken: float) -> None:
-        """Save round data to database immediately"""
-        try:
-            round_data = {
-                'player_name': self.player_name,
-                'item_name': round_obj.item_name,
-                'category': round_obj.category,
-                'subcategory': round_obj.subcategory,
-                'difficulty': self.difficulty.get('name', 'normal') if self.difficulty else 'normal',
-                'language': self.language,
-                'facts_revealed': round_obj.facts_shown,
-                'total_facts': round_obj.total_facts,
-                'guessed_correctly': round_obj.correct,
-                'guess_attempts': round_obj.guess_attempts,
-                'final_guess': self.guesses[-1] if self.guesses else '',
-                'similarity_score': round_obj.similarity_score,
-                'match_type': round_obj.match_type,
-                'time_taken': round_obj.time_taken,
-                'round_score': round_obj.round_score
-            }
-            
-            # Save to database (without session_id for now - will be linked when session is saved)
-            if db_handler and db_handler.is_connected():
-                success = db_handler.save_round(None, round_data, self.current_question_id)
-                if success:
-                    logger.debug(f"Round saved to database: {round_obj.item_name} ({'correct' if round_obj.correct else 'incorrect'})")
-                else:
-                    logger.warning(f"Failed to save round to database: {round_obj.item_name}")
-            else:
-                logger.warning("Database not connected, round not saved")
-            
-        except Exception as e:
-            logger.error(f"Error saving round to database: {e}")
-
     def _create_game_round(self, correct: bool, similarity: float, match_type: str, time_taken: float) -> GameRound:
         """Create a GameRound object for scoring"""
         # Ensure we have valid item and category names (should already be checked in _end_round)
@@ -963,7 +1062,12 @@ class WebGameSession:
             match_type=match_type,
             time_taken=time_taken,
             round_score=0,
-            hints_used=self.hints_used
+            hints_used=self.hints_used,
+            # Carried to the game_rounds row written when the session is saved
+            difficulty=self.difficulty.get('name', 'normal') if self.difficulty else 'normal',
+            language=self.language,
+            final_guess=self.guesses[-1] if self.guesses else '',
+            question_id=self.current_question_id
         )
 
     def _calculate_and_apply_score(self, round_obj: GameRound) -> None:
@@ -979,48 +1083,22 @@ class WebGameSession:
         self.total_score += round_obj.round_score
 
     def _save_round_history(self, round_obj: GameRound, correct: bool, time_taken: float) -> None:
-        """Save round data to history and database"""
+        """Save round data to history; the round reaches the database with the session save"""
         try:
-            round_record = {
-                'category': self.current_category,
-                'item_name': self.current_item,
-                'facts_shown': self.facts_shown,
-                'is_correct': correct,
-                'round_score': round_obj.round_score,
-                'time_taken_seconds': time_taken,
-                'guesses': self.guesses.copy()
-            }
-            
-            self.round_history.append(type('RoundRecord', (), round_record)())
+            self.round_history.append(RoundRecord(
+                category=self.current_category,
+                item_name=self.current_item,
+                facts_shown=self.facts_shown,
+                is_correct=correct,
+                round_score=round_obj.round_score,
+                time_taken_seconds=time_taken,
+                guesses=tuple(self.guesses)
+            ))
             logger.info(f"Round completed: {self.current_item} ({'correct' if correct else 'incorrect'})")
-            
-            # Also save round to database immediately
-            round_data = {
-                'player_name': self.player_name,
-                'item_name': round_obj.item_name,
-                'category': round_obj.category,
-                'subcategory': round_obj.subcategory,
-                'difficulty': getattr(self, 'current_difficulty', 'normal'),
-                'language': getattr(self, 'current_language', 'en'),
-                'facts_revealed': round_obj.facts_shown,
-                'total_facts': round_obj.total_facts,
-                'guessed_correctly': round_obj.correct,
-                'guess_attempts': round_obj.guess_attempts,
-                'final_guess': self.guesses[-1] if self.guesses else '',
-                'similarity_score': round_obj.similarity_score,
-                'match_type': round_obj.match_type,
-                'time_taken': round_obj.time_taken,
-                'round_score': round_obj.round_score
-            }
-            
-            # Save to database (without session_id for now - will be linked when session is saved)
-            if db_handler and db_handler.is_connected():
-                db_handler.save_round(None, round_data)
-            
-        except Exception as db_error:
-            logger.error(f"Failed to save round data: {db_error}")
+        except Exception as e:
+            logger.error(f"Failed to save round data: {e}")
 
-    def _get_round_feedback(self, auto_revealed: bool) -> str:
+    def _get_round_feedback(self, auto_revealed: bool, similarity: float, match_type: str) -> str:
         """Get appropriate feedback message for the round"""
         if auto_revealed:
             if lang_manager and lang_manager.current_language == 'pl':
@@ -1028,7 +1106,8 @@ class WebGameSession:
             else:
                 return f"💔 Answer revealed after {self.max_failed_attempts} failed attempts!"
         else:
-            return self.answer_checker.get_feedback(self.guesses[-1], self.current_item, lang_manager)
+            language = lang_manager.current_language if lang_manager else 'en'
+            return self.answer_checker.get_feedback(similarity, match_type, language)
 
     def _build_round_result(self, correct: bool, round_obj: GameRound, time_taken: float, 
                            similarity: float, feedback: str, auto_revealed: bool) -> Dict:
@@ -1051,20 +1130,105 @@ class WebGameSession:
             "hint_display": self.get_current_hint_display()
         }
 
+    def release_memory(self) -> None:
+        """Drop per-round data once a finished game has been saved; totals and score are kept"""
+        self.rounds = []
+        self.round_history = []
+        self.guesses = []
+        self.current_item = None
+        self.current_facts = []
+        self._hint_chars = []
+        self._hint_positions = []
+
     def is_game_complete(self) -> bool:
         """Check if the game session is complete"""
         if self.max_rounds is None:
             return False  # Unlimited rounds mode
         return self.rounds_completed >= self.max_rounds
 
+class SessionStore(TTLCache):
+    """Active game sessions, dropped after an hour idle or when the store is full.
+    
+    Reads refresh a session's expiry, and sessions with unsaved rounds are handed to the
+    background save executor as they are evicted (outside the lock).
+    """
+    
+    def __init__(self, maxsize=10000, ttl=3600):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.RLock()
+        self._evicted = []
+    
+    def __contains__(self, key):
+        with self._lock:
+            return super().__contains__(key)
+    
+    def __getitem__(self, key):
+        with self._lock:
+            game_session = super().__getitem__(key)
+            super().__setitem__(key, game_session)  # Re-insert so the TTL counts from last use
+        self._save_evicted()
+        return game_session
+    
+    def __setitem__(self, key, game_session):
+        with self._lock:
+            super().__setitem__(key, game_session)
+        self._save_evicted()
+    
+    def __delitem__(self, key):
+        with self._lock:
+            super().__delitem__(key)
+    
+    def get(self, key, default=None):
+        """Look a session up in one locked step, so it cannot expire between check and read."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def pop(self, key, default=None):
+        """Remove and return a session atomically; concurrent callers get the default."""
+        with self._lock:
+            try:
+                game_session = super().__getitem__(key)
+            except KeyError:
+                return default
+            super().__delitem__(key)
+        return game_session
+    
+    def expire(self, time=None):
+        # Needs cachetools >= 5.4, where expire() returns the expired (key, value) pairs
+        expired = super().expire(time)
+        self._evicted.extend(game_session for _, game_session in expired)
+        return expired
+    
+    def popitem(self):
+        key, game_session = super().popitem()
+        self._evicted.append(game_session)
+        return key, game_session
+    
+    def _save_evicted(self):
+        """Persist evicted sessions that still have unsaved rounds."""
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+        for game_session in evicted:
+            if game_session._dirty_rounds:
+                _session_save_executor.submit(_save_ended_session, game_session, datetime.now())
+
 # Store active sessions and game components
-active_sessions: Dict[str, WebGameSession] = {}
+active_sessions: SessionStore = SessionStore(maxsize=10000, ttl=3600)
 game_engine = AzureOpenAIGameEngine()
 category_manager = GameCategoryManager(lang_manager=lang_manager)
 
 # Global category manager for tracking across all sessions
 global_category_manager = GameCategoryManager(lang_manager=lang_manager)
 
+@functools.lru_cache(maxsize=4)
+def _request_managers(language: str):
+    """Language and category managers for a language, built once and shared by requests."""
+    request_lang_manager = LanguageManager()
+    request_lang_manager.set_language(language)
+    return request_lang_manager, GameCategoryManager(lang_manager=request_lang_manager)
+
 def _localize_category_for_db(category: Optional[str], language: str) -> Optional[str]:
     """Convert an English category key to the localized category name stored in DB for given language.
 
@@ -1076,32 +1240,24 @@ def _localize_category_for_db(category: Optional[str], language: str) -> Optiona
     if language == 'en':
         return category
     try:
-        lm = LanguageManager()
-        lm.set_language(language)
-        cm = GameCategoryManager(lang_manager=lm)
-        cat_obj = cm.find_category(category)
-        if not cat_obj:
-            return category
-        localized = cm.get_localized_category(cat_obj)
-        return localized.get('name', category)
+        return category_manager.get_localized_category_name(category, language)
     except Exception:
         return category
 
-def save_session_to_db(game_session: WebGameSession) -> bool:
+def save_session_to_db(game_session: WebGameSession, end_time: Optional[datetime] = None) -> bool:
     """Save game session data to database using CloudScoreKeeper"""
     try:
         # Convert WebGameSession to GameSession format expected by score keeper
-        from scoring import GameSession
-        from datetime import datetime
         
         # Calculate session statistics
-        rounds_won = sum(1 for round_obj in game_session.rounds if round_obj.correct)
-        rounds_lost = len(game_session.rounds) - rounds_won
-        
-        # Calculate averages
-        if game_session.rounds:
-            avg_facts = sum(r.facts_shown for r in game_session.rounds) / len(game_session.rounds)
-            avg_time = sum(r.time_taken for r in game_session.rounds) / len(game_session.rounds)
+        rounds_played = len(game_session.rounds)
+        rounds_won = game_session.rounds_won
+        rounds_lost = rounds_played - rounds_won
+        
+        # Calculate averages from the running totals
+        if rounds_played:
+            avg_facts = game_session.total_facts_shown / rounds_played
+            avg_time = game_session.total_time / rounds_played
         else:
             avg_facts = 0.0
             avg_time = 0.0
@@ -1109,7 +1265,7 @@ def save_session_to_db(game_session: WebGameSession) -> bool:
         # Create a scoring.GameSession object
         scoring_session = GameSession(
             start_time=game_session.session_start_time,
-            end_time=datetime.now(),
+            end_time=end_time or datetime.now(),
             rounds=game_session.rounds,  # GameRound objects from WebGameSession
             total_score=game_session.total_score,
             rounds_won=rounds_won,
@@ -1121,6 +1277,7 @@ def save_session_to_db(game_session: WebGameSession) -> bool:
         
         # Save using the CloudScoreKeeper
         score_keeper.update_high_scores(scoring_session)
+        game_session._dirty_rounds = 0
         
         logger.info(f"Session saved to database for {game_session.player_name}: {game_session.total_score} points, {len(game_session.rounds)} rounds (won: {rounds_won}, lost: {rounds_lost})")
         return True
@@ -1129,6 +1286,70 @@ def save_session_to_db(game_session: WebGameSession) -> bool:
         logger.error(f"Error in save_session_to_db: {e}")
         return False
 
+# Finished games and sessions leaving memory are saved here, off the request thread
+_session_save_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='session-save')
+
+def _save_ended_session(game_session: WebGameSession, end_time: datetime):
+    """Save a session that has left active_sessions and log the outcome (runs in the executor)."""
+    if save_session_to_db(game_session, end_time):
+        logger.info(f"Session ended and saved for {game_session.player_name}")
+    else:
+        logger.warning(f"Failed to save session for {game_session.player_name}")
+
+def _queue_completed_session_save(game_session: WebGameSession):
+    """Save a finished game in the executor and free its round data once the save succeeds."""
+    # Claim the pending rounds now so /api/end_session or eviction don't queue a second save
+    pending_rounds, game_session._dirty_rounds = game_session._dirty_rounds, 0
+    
+    def _on_saved(future):
+        if future.result():
+            # Nothing else can be played in this session, so free the round data now
+            game_session.release_memory()
+        else:
+            game_session._dirty_rounds = pending_rounds  # Left for end_session/eviction to retry
+            logger.warning(f"Failed to save completed session for {game_session.player_name}")
+    
+    _session_save_executor.submit(save_session_to_db, game_session,
+                                  game_session.last_round_end_time).add_done_callback(_on_saved)
+
+def ojsonify(data, status=200):
+    """Serialize a JSON response with orjson (Flask's jsonify goes through stdlib json)."""
+    return Response(orjson.dumps(data), status=status, mimetype='application/json')
+
+def ojsonify_compressed(data, status=200):
+    """Like ojsonify, but gzips larger bodies (level 1) when the client accepts gzip."""
+    body = orjson.dumps(data)
+    response = Response(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip.compress(body, compresslevel=1))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+_NO_SESSION_BODY = orjson.dumps({'error': NO_ACTIVE_SESSION_ERROR})
+
+def _require_session(session_id):
+    """Return the live WebGameSession for session_id, or None (one locked store lookup)."""
+    return active_sessions.get(session_id) if session_id else None
+
+def no_session_response():
+    """400 response for requests without a live game session (body serialized once at import)."""
+    return Response(_NO_SESSION_BODY, status=400, mimetype='application/json')
+
+def get_json_fast():
+    """Parse the request body with orjson once per request; later calls reuse the result."""
+    if '_json' not in g:
+        data = orjson.loads(request.get_data(cache=True) or b'{}')
+        # Handlers read fields with .get(), so a body that isn't a JSON object counts as empty
+        g._json = data if isinstance(data, dict) else {}
+    return g._json
+
+@app.errorhandler(orjson.JSONDecodeError)
+def handle_invalid_json(e):
+    """Malformed request bodies get a JSON 400 instead of each handler's generic 500."""
+    logger.warning(f"Invalid JSON request body: {e}")
+    return ojsonify({'error': 'Invalid JSON body'}, 400)
+
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
@@ -1151,9 +1372,9 @@ def health_check():
         except Exception:
             status["database"] = "error"
         
-        return jsonify(status), 200
+        return ojsonify(status), 200
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             "status": "unhealthy",
             "error": str(e),
             "timestamp": datetime.now().isoformat()
@@ -1164,116 +1385,112 @@ def index():
     """Main game page"""
     return render_template('index.html')
 
+_API_RESPONSE_CACHE = {}  # (endpoint, language) -> serialized JSON body for static lookup endpoints
+
+def _cached_json_response(endpoint: str, language: str, build):
+    """Serve a static per-language JSON payload, building and serializing it only once."""
+    language = 'pl' if language == 'pl' else 'en'
+    cache_key = (endpoint, language)
+    body = _API_RESPONSE_CACHE.get(cache_key)
+    if body is None:
+        body = _API_RESPONSE_CACHE[cache_key] = orjson.dumps(build(language))
+    return Response(body, mimetype='application/json')
+
+def _build_categories(language: str) -> List[Dict]:
+    """Build the category list with display names for the given language."""
+    # Categories were parsed once when category_manager loaded; build new dicts rather than mutate them
+    categories = category_manager.categories
+    
+    if language == 'pl':
+        # Use Polish translations if available, fallback to English
+        return [{**category,
+                 'display_name': category.get('name_pl', category['name']),
+                 'display_description': category.get('description_pl', category['description'])}
+                for category in categories]
+    # Use English names
+    return [{**category,
+             'display_name': category['name'],
+             'display_description': category['description']}
+            for category in categories]
+
+def _build_languages(language: str) -> List[Dict]:
+    """Build the list of available languages (same for every language)."""
+    return [
+        {'code': 'en', 'name': 'English', 'flag': '🇬🇧'},
+        {'code': 'pl', 'name': 'Polski', 'flag': '🇵🇱'}
+    ]
+
 @app.route('/api/categories')
 def get_categories():
     """Get available game categories with optional language translation"""
     try:
-        language = request.args.get('lang', 'en')
-        
-        with open(CATEGORIES_FILE, 'r', encoding=ENCODING_UTF8) as f:
-            categories_data = json.load(f)
-        
-        categories = categories_data['categories']
-        
-        # Set display names based on language
-        for category in categories:
-            if language == 'pl':
-                # Use Polish translations if available, fallback to English
-                category['display_name'] = category.get('name_pl', category['name'])
-                category['display_description'] = category.get('description_pl', category['description'])
-            else:
-                # Use English names
-                category['display_name'] = category['name']
-                category['display_description'] = category['description']
-        
-        return jsonify(categories)
+        return _cached_json_response('categories', request.args.get('lang', 'en'), _build_categories)
     except Exception as e:
         logger.error(f"Error loading categories: {e}")
-        return jsonify({"error": "Failed to load categories"}), 500
+        return ojsonify({"error": "Failed to load categories"}), 500
 
 @app.route('/api/difficulties')
 def get_difficulties():
     """Get available difficulty levels with optional language translation"""
     try:
-        language = request.args.get('lang', 'en')
-        
-        difficulties = []
-        for level in DifficultyLevel.get_all_levels():
-            # Get localized names based on language parameter
-            if language == 'pl':
-                display_name = level['pl_name']
-                description = level['pl_desc']
-            else:
-                display_name = level['name'].replace('_', ' ').title()
-                description = level['en_desc']
-            
-            difficulties.append({
-                'name': level['name'],
-                'display_name': display_name,
-                'description': description,
-                'score_multiplier': level['score_multiplier']
-            })
-        return jsonify(difficulties)
+        language = 'pl' if request.args.get('lang', 'en') == 'pl' else 'en'
+        return Response(DifficultyLevel._difficulties_json[language], mimetype='application/json')
     except Exception as e:
         logger.error(f"Error loading difficulties: {e}")
-        return jsonify({"error": "Failed to load difficulties"}), 500
+        return ojsonify({"error": "Failed to load difficulties"}), 500
 
 @app.route('/api/languages')
 def get_languages():
     """Get available languages"""
     try:
-        languages = [
-            {'code': 'en', 'name': 'English', 'flag': '🇬🇧'},
-            {'code': 'pl', 'name': 'Polski', 'flag': '🇵🇱'}
-        ]
-        return jsonify(languages)
+        return _cached_json_response('languages', 'en', _build_languages)
     except Exception as e:
         logger.error(f"Error loading languages: {e}")
-        return jsonify({"error": "Failed to load languages"}), 500
+        return ojsonify({"error": "Failed to load languages"}), 500
 
 @app.route('/api/leaderboard')
 def get_leaderboard():
     """Get global leaderboard"""
     try:
         leaderboard_text = score_keeper.get_top_scores_display(lang_manager)
-        return jsonify({"leaderboard": leaderboard_text})
+        return ojsonify({"leaderboard": leaderboard_text})
     except Exception as e:
         logger.error(f"Error getting leaderboard: {e}")
-        return jsonify({"error": "Failed to load leaderboard"}), 500
+        return ojsonify({"error": "Failed to load leaderboard"}), 500
 
 @app.route('/api/player/<player_name>/stats')
 def get_player_stats(player_name):
     """Get player statistics"""
     try:
         stats_text = score_keeper.get_player_stats(player_name, lang_manager)
-        return jsonify({"stats": stats_text})
+        return ojsonify({"stats": stats_text})
     except Exception as e:
         logger.error(f"Error getting player stats: {e}")
-        return jsonify({"error": "Failed to load player stats"}), 500
+        return ojsonify({"error": "Failed to load player stats"}), 500
 
 @app.route('/api/set_language', methods=['POST'])
 def set_language():
     """Set the current language"""
     try:
-        data = request.get_json()
+        data = get_json_fast()
         language = data.get('language', 'en')
         
         if language in ['en', 'pl']:
             session['language'] = language
             lang_manager.set_language(language)
-            return jsonify({"success": True, "language": language})
+            return ojsonify({"success": True, "language": language})
         else:
-            return jsonify({"error": "Invalid language"}), 400
+            return ojsonify({"error": "Invalid language"}), 400
     except Exception as e:
         logger.error(f"Error setting language: {e}")
-        return jsonify({"error": "Failed to set language"}), 500
+        return ojsonify({"error": "Failed to set language"}), 500
 
 @app.route('/api/start_game', methods=['POST'])
 def handle_start_game():
     """Handle game start"""
     try:
-        data = request.get_json()
-        print(f"🎮 Received start_game request with data: {data}")
+        data = get_json_fast()
+        logger.debug("Received start_game request with data: %s", data)
         
         player_name = data.get('player_name', 'Anonymous')
         language = data.get('language', 'en')
@@ -1281,40 +1498,27 @@ def handle_start_game():
         difficulty_name = data.get('difficulty', 'normal')
         max_rounds = data.get('max_rounds', None)  # New: rounds limit (None = unlimited)
         
-        print(f"Player: {player_name}, Category: {category}, Difficulty: {difficulty_name}, Language: {language}, Max Rounds: {max_rounds}")
+        logger.debug("Player: %s, Category: %s, Difficulty: %s, Language: %s, Max Rounds: %s",
+                     player_name, category, difficulty_name, language, max_rounds)
         
         # If no category specified, select random category
         if not category:
-            with open(CATEGORIES_FILE, 'r', encoding=ENCODING_UTF8) as f:
-                categories_data = json.load(f)
-            available_categories = [cat['name'] for cat in categories_data['categories']]
-            category = random.choice(available_categories)
+            category = random.choice(category_manager.get_category_names())
             logger.info(f"Selected random category: {category}")
-            print(f"🎲 Random category selected: {category}")
         
         # Find difficulty level
-        difficulty = DifficultyLevel.get_level('normal')  # Use get_level method
-        if difficulty is None:
-            difficulty = DifficultyLevel.NORMAL  # Fallback to class variable
-        for level in DifficultyLevel.get_all_levels():
-            if level and level.get('name') == difficulty_name:
-                difficulty = level
-                break
+        difficulty = _get_difficulty_level(difficulty_name)
         
         # Create new session with unique ID
-        session_id = str(uuid.uuid4())
+        session_id = secrets.token_urlsafe(16)
         game_session = WebGameSession(player_name, language, max_rounds)  # Pass max_rounds
         active_sessions[session_id] = game_session
         
         # Store session ID in the session
         session['game_session_id'] = session_id
         
-        # Create a language manager for this request
-        request_lang_manager = LanguageManager()
-        request_lang_manager.set_language(language)
-        
-        # Update category manager with the request language manager
-        request_category_manager = GameCategoryManager(lang_manager=request_lang_manager)
+        # Language and category managers for the request language
+        request_lang_manager, request_category_manager = _request_managers(language)
         
         # Generate game content using AI with proper subcategory hint
         subcategory_hint = request_category_manager.get_category_hint(category)
@@ -1338,8 +1542,8 @@ def handle_start_game():
                 item_data.get('question_id')
             )
             
-            print("✅ Game started successfully")
-            return jsonify({
+            logger.debug("Game started successfully")
+            return ojsonify({
                 'session_id': session_id,
                 'category': category,
                 'subcategory': localized_subcategory,
@@ -1354,76 +1558,76 @@ def handle_start_game():
                 'hint_display': ""
             })
         else:
-            print("❌ Failed to generate item data")
-            return jsonify({'error': 'Failed to generate game content'}), 500
+            logger.error("Failed to generate item data")
+            return ojsonify({'error': 'Failed to generate game content'}), 500
             
     except Exception as e:
         logger.error(f"Error starting game: {e}")
-        return jsonify({'error': 'Failed to start game'}), 500
+        return ojsonify({'error': 'Failed to start game'}), 500
 
 @app.route('/api/request_fact', methods=['POST'])
 def handle_request_fact():
     """Handle fact request"""
     try:
-        data = request.get_json() or {}
+        data = get_json_fast()
         
         session_id = data.get('session_id') or session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
-        
-        game_session = active_sessions[session_id]
+        game_session = _require_session(session_id)
+        if game_session is None:
+            return no_session_response()
         fact = game_session.reveal_next_fact()
         
         if fact:
-            return jsonify({
+            return ojsonify({
                 'fact': fact,
                 'fact_number': game_session.facts_shown,
                 'total_facts': len(game_session.current_facts)
             })
         else:
-            return jsonify({'error': 'No more facts available'}), 400
+            return ojsonify({'error': 'No more facts available'}), 400
             
     except Exception as e:
         logger.error(f"Error revealing fact: {e}")
-        return jsonify({'error': 'Failed to reveal fact'}), 500
+        return ojsonify({'error': 'Failed to reveal fact'}), 500
 
 @app.route('/api/submit_guess', methods=['POST'])
 def handle_submit_guess():
     """Handle guess submission"""
     try:
-        data = request.get_json()
+        data = get_json_fast()
         session_id = data.get('session_id') or session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
+        game_session = _require_session(session_id)
+        if game_session is None:
+            return no_session_response()
         
         guess = data.get('guess', '').strip()
         if not guess:
-            return jsonify({'error': 'Please enter a guess'}), 400
+            return ojsonify({'error': 'Please enter a guess'}), 400
         
-        game_session = active_sessions[session_id]
         result = game_session.add_guess(guess)
         
-        # Save session if round ended (correct answer OR auto-revealed after max attempts)
-        # Check for both winning condition and auto-reveal condition
-        if result.get('correct', False) or result.get('auto_revealed', False):
-            save_session_to_db(game_session)
+        # Save the session once, when the game is complete, without holding up the response; each
+        # save inserts a new game_sessions row, so unfinished games are saved by /api/end_session
+        # or when they leave active_sessions
+        round_ended = result.get('correct', False) or result.get('auto_revealed', False)
+        if round_ended and game_session.is_game_complete():
+            _queue_completed_session_save(game_session)
         
-        return jsonify(result)
+        return ojsonify(result)
             
     except Exception as e:
         logger.error(f"Error processing guess: {e}")
-        return jsonify({'error': 'Failed to process guess'}), 500
+        return ojsonify({'error': 'Failed to process guess'}), 500
 
 @app.route('/api/get_hint', methods=['POST'])
 def handle_get_hint():
     """Handle hint request"""
     try:
-        data = request.get_json() or {}
+        data = get_json_fast()
         session_id = data.get('session_id') or session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
-        
-        game_session = active_sessions[session_id]
+        game_session = _require_session(session_id)
+        if game_session is None:
+            return no_session_response()
         hint_result = game_session.get_hint()
         
         # Add scoring information to the hint result
@@ -1433,24 +1637,23 @@ def handle_get_hint():
             hint_result['hint_penalty'] = hint_penalty
             hint_result['total_hint_penalty'] = hint_penalty * game_session.hints_used
         
-        return jsonify(hint_result)
+        return ojsonify(hint_result)
             
     except Exception as e:
         logger.error(f"Error getting hint: {e}")
-        return jsonify({'error': 'Failed to get hint'}), 500
+        return ojsonify({'error': 'Failed to get hint'}), 500
 
 @app.route('/api/give_up', methods=['POST'])
 def handle_give_up():
     """Give up the current round and reveal the answer"""
     try:
-        data = request.get_json()
+        data = get_json_fast()
         session_id = data.get('session_id') or session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
-        
-        game_session = active_sessions[session_id]
+        game_session = _require_session(session_id)
+        if game_session is None:
+            return no_session_response()
         if not game_session.current_item:
-            return jsonify({'error': 'No active round to give up'}), 400
+            return ojsonify({'error': 'No active round to give up'}), 400
         
         # End the round as incorrect (give up)
         result = game_session._end_round(
@@ -1464,76 +1667,67 @@ def handle_give_up():
         result['gave_up'] = True
         result['message'] = 'You gave up this round'
         
-        return jsonify(result)
+        return ojsonify(result)
         
     except Exception as e:
         logger.error(f"Error giving up: {e}")
-        return jsonify({'error': 'Failed to give up'}), 500
+        return ojsonify({'error': 'Failed to give up'}), 500
 
 @app.route('/api/new_round', methods=['POST'])
 def handle_new_round():
     """Start a new round"""
+    data = get_json_fast()
+    session_id = data.get('session_id') or session.get('game_session_id')
+    game_session = _require_session(session_id)
+    if game_session is None:
+        return no_session_response()
+    if game_session.is_game_complete():
+        return ojsonify({'error': 'Game session is already complete'}), 400
+    
+    # Extract request parameters
+    category = data.get('category', '')
+    difficulty_name = data.get('difficulty', 'normal')
+    language = data.get('language', 'en')
+    
+    # Set up category and difficulty
+    category = _get_or_select_category(category)
+    difficulty = _get_difficulty_level(difficulty_name)
+    
     try:
-        data = request.get_json()
-        session_id = data.get('session_id') or session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
-        
-        game_session = active_sessions[session_id]
-        if game_session.is_game_complete():
-            return jsonify({'error': 'Game session is already complete'}), 400
-        
-        # Extract request parameters
-        category = data.get('category', '')
-        difficulty_name = data.get('difficulty', 'normal')
-        language = data.get('language', 'en')
-        
-        # Set up category and difficulty
-        category = _get_or_select_category(category)
-        difficulty = _get_difficulty_level(difficulty_name)
-        
         # Generate new round content
-        item_data = _generate_round_content(category, difficulty, language, session_id, game_session.player_name)
+        item_data, localized_subcategory = _generate_round_content(
+            category, difficulty, language, session_id, game_session.player_name
+        )
         
         if item_data:
-            return _create_successful_round_response(game_session, category, item_data, difficulty)
+            return _create_successful_round_response(game_session, category, item_data, difficulty, localized_subcategory)
         else:
-            return jsonify({'error': 'Failed to generate new round'}), 500
+            return ojsonify({'error': 'Failed to generate new round'}), 500
             
     except Exception as e:
         logger.error(f"Error starting new round: {e}")
-        return jsonify({'error': 'Failed to start new round'}), 500
+        return ojsonify({'error': 'Failed to start new round'}), 500
 
 def _get_or_select_category(category: str) -> str:
     """Get the specified category or select a random one"""
     if not category:
-        with open(CATEGORIES_FILE, 'r', encoding=ENCODING_UTF8) as f:
-            categories_data = json.load(f)
-        available_categories = [cat['name'] for cat in categories_data['categories']]
-        category = random.choice(available_categories)
+        category = random.choice(category_manager.get_category_names())
         logger.info(f"Selected random category for new round: {category}")
     return category
 
 def _get_difficulty_level(difficulty_name: str):
     """Get the difficulty level object"""
-    difficulty = DifficultyLevel.get_level('normal')
-    if difficulty is None:
-        difficulty = DifficultyLevel.NORMAL
-    
-    for level in DifficultyLevel.get_all_levels():
-        if level and level.get('name') == difficulty_name:
-            difficulty = level
-            break
-    return difficulty
+    return DifficultyLevel.get_level(difficulty_name) or DifficultyLevel.NORMAL
 
 def _generate_round_content(category: str, difficulty, language: str, session_id: str, player_name: str):
-    """Generate new round content using AI"""
-    request_lang_manager = LanguageManager()
-    request_lang_manager.set_language(language)
-    request_category_manager = GameCategoryManager(lang_manager=request_lang_manager)
+    """Generate new round content using AI.
+    
+    Returns (item_data, localized_subcategory) so the response reports the hint the item was built from.
+    """
+    request_lang_manager, request_category_manager = _request_managers(language)
     
     subcategory_hint = request_category_manager.get_category_hint(category)
-    return game_engine.generate_game_item(
+    item_data = game_engine.generate_game_item(
         category, 
         subcategory_hint, 
         request_lang_manager, 
@@ -1542,17 +1736,11 @@ def _generate_round_content(category: str, difficulty, language: str, session_id
         session_id,
         player_name
     )
+    localized_subcategory = request_category_manager.get_localized_hint(subcategory_hint) if subcategory_hint else None
+    return item_data, localized_subcategory
 
-def _create_successful_round_response(game_session, category: str, item_data, difficulty):
+def _create_successful_round_response(game_session, category: str, item_data, difficulty, localized_subcategory):
     """Create response for successful round generation"""
-    # Create language manager for localization
-    request_lang_manager = LanguageManager()
-    request_lang_manager.set_language(game_session.language)
-    request_category_manager = GameCategoryManager(lang_manager=request_lang_manager)
-    
-    subcategory_hint = request_category_manager.get_category_hint(category)
-    localized_subcategory = request_category_manager.get_localized_hint(subcategory_hint) if subcategory_hint else None
-    
     game_session.start_new_round(
         category, 
         item_data['name'], 
@@ -1561,7 +1749,7 @@ def _create_successful_round_response(game_session, category: str, item_data, di
         item_data.get('question_id')
     )
     
-    return jsonify({
+    return ojsonify({
         'category': category,
         'subcategory': localized_subcategory,
         'facts_available': len(item_data['facts']),
@@ -1579,8 +1767,8 @@ def _create_successful_round_response(game_session, category: str, item_data, di
 def handle_start_offline_game():
     """Handle offline game start using database questions"""
     try:
-        data = request.get_json()
-        print(f"🎮 Received start_offline_game request with data: {data}")
+        data = get_json_fast()
+        logger.debug("Received start_offline_game request with data: %s", data)
         
         player_name = data.get('player_name', 'Anonymous')
         language = data.get('language', 'en')
@@ -1588,96 +1776,57 @@ def handle_start_offline_game():
         difficulty_name = data.get('difficulty', 'normal')
         max_rounds = data.get('max_rounds', None)
         
-        print(f"OFFLINE Player: {player_name}, Category: {category}, Difficulty: {difficulty_name}, Language: {language}, Max Rounds: {max_rounds}")
-        
-        # Debug: Check database connection
-        print(f"🔌 Database connected: {db_handler.is_connected()}")
+        logger.debug("OFFLINE Player: %s, Category: %s, Difficulty: %s, Language: %s, Max Rounds: %s",
+                     player_name, category, difficulty_name, language, max_rounds)
         
         # When language isn't English, convert the category to the localized value stored in DB
         db_category = _localize_category_for_db(category if category else None, language)
 
-        # Check if we have any offline questions available (first, with selected difficulty)
-        total_questions = db_handler.get_offline_question_count(
+        # Pick a random unused question and mark it used in one round trip
+        question_data = db_handler.pick_and_mark_offline_question(
             category=db_category,
             difficulty=difficulty_name,
-            language=language,
-            exclude_used=True
+            language=language
         )
 
-        print(f"📊 Total questions found (with difficulty='{difficulty_name}'): {total_questions}")
-
-        # Also check total questions in database without filters for comparison
-        total_all_questions = db_handler.get_offline_question_count(
-            category=None,
-            difficulty=None,
-            language=language,
-            exclude_used=False
-        )
-        print(f"📊 Total questions in database for language '{language}': {total_all_questions}")
-
         # Fallback: if none for the selected difficulty, try any difficulty
-        if total_questions == 0:
-            total_any_difficulty = db_handler.get_offline_question_count(
+        if not question_data:
+            difficulty_name = None  # signal that the question was not filtered by difficulty
+            question_data = db_handler.pick_and_mark_offline_question(
                 category=db_category,
                 difficulty=None,
-                language=language,
-                exclude_used=True
+                language=language
             )
-            print(f"📊 Fallback (any difficulty) questions found: {total_any_difficulty}")
-
-            # If we have questions in other difficulties, use them
-            if total_any_difficulty > 0:
-                total_questions = total_any_difficulty
-                difficulty_name = None  # signal to selection below to not filter by difficulty
-
-        if total_questions == 0:
-            # Set language for translations
-            lang_manager.set_language(language)
-            return jsonify({
-                'error': lang_manager.get_text('no_offline_questions'),
-                'message': lang_manager.get_text('no_offline_questions_message'),
-                'available_questions': 0
-            }), 404
         
-        # Get a random question from database
-        question_data = db_handler.get_random_offline_question(
-            category=db_category,
-            difficulty=difficulty_name,
-            language=language,
-            exclude_used=True
-        )
-
-        # Fallback: if none for selected difficulty, try any difficulty
         if not question_data:
-            question_data = db_handler.get_random_offline_question(
+            # Only count when nothing was picked, to tell "no questions" apart from a lost race
+            _, available_questions = db_handler.get_offline_question_counts(
                 category=db_category,
                 difficulty=None,
-                language=language,
-                exclude_used=True
+                language=language
             )
-        
-        if not question_data:
-            return jsonify({
+            if available_questions == 0:
+                # Cached per-language manager; the shared lang_manager is not switched per request
+                request_lang_manager, _ = _request_managers(language)
+                return ojsonify({
+                    'error': request_lang_manager.get_text('no_offline_questions'),
+                    'message': request_lang_manager.get_text('no_offline_questions_message'),
+                    'available_questions': 0
+                }), 404
+            return ojsonify({
                 'error': 'No offline question found',
                 'message': 'Unable to retrieve question from database.',
-                'available_questions': total_questions
+                'available_questions': available_questions
             }), 500
         
-        # Mark question as used
-        db_handler.mark_question_as_used(question_data['id'])
+        # A question was just marked used, so cached offline counts are stale
+        _offline_status_counts.cache_clear()
         
         # Find difficulty level (if difficulty_name is None due to fallback, keep 'normal' for scoring)
-        difficulty = DifficultyLevel.get_level('normal')  # Use get_level method
-        if difficulty is None:
-            difficulty = DifficultyLevel.NORMAL  # Fallback to class variable
-        if difficulty_name:
-            for level in DifficultyLevel.get_all_levels():
-                if level and level.get('name') == difficulty_name:
-                    difficulty = level
-                    break
+        difficulty = _get_difficulty_level(difficulty_name)
         
         # Create new session with unique ID
-        session_id = str(uuid.uuid4())
+        session_id = secrets.token_urlsafe(16)
         game_session = WebGameSession(player_name, language, max_rounds)
         active_sessions[session_id] = game_session
         
@@ -1699,8 +1848,8 @@ def handle_start_offline_game():
             question_data['id']  # Use database ID as question_id
         )
         
-        print(f"✅ Offline game started successfully with question: {item_name}")
-        return jsonify({
+        logger.debug("Offline game started successfully with question: %s", item_name)
+        return ojsonify({
             'session_id': session_id,
             'category': category_used,
             'subcategory': subcategory,
@@ -1708,17 +1857,37 @@ def handle_start_offline_game():
             'facts_available': len(facts),
             'difficulty': difficulty_name or 'any',
             'mode': 'offline',
-            'total_offline_questions': total_questions,
             'question_id': question_data['id']
         })
         
     except Exception as e:
         logger.error(f"Error starting offline game: {e}")
-        return jsonify({
+        return ojsonify({
             'error': 'Failed to start offline game',
             'message': str(e)
         }), 500
 
+@cachetools.func.ttl_cache(maxsize=256, ttl=5)
+def _offline_status_counts(category, difficulty, language):
+    """Offline question counts (total, unused, total_any, unused_any), cached briefly for UI polling."""
+    # Total (including used) and unused questions with filters, in one query
+    total_questions, unused_questions = db_handler.get_offline_question_counts(
+        category=category,
+        difficulty=difficulty,
+        language=language
+    )
+
+    # If none available for the selected difficulty, try any difficulty as a fallback
+    if unused_questions == 0:
+        total_any, unused_any = db_handler.get_offline_question_counts(
+            category=category,
+            difficulty=None,
+            language=language
+        )
+    else:
+        total_any, unused_any = total_questions, unused_questions
+    return total_questions, unused_questions, total_any, unused_any
+
 @app.route('/api/offline_status', methods=['GET'])
 def get_offline_status():
     """Get offline mode status and available question counts with category/difficulty filtering"""
@@ -1731,44 +1900,15 @@ def get_offline_status():
         category_filter = category if category else None
         category_filter = _localize_category_for_db(category_filter, language)
 
-        # Check total questions available (including used ones) with filters
-        total_questions = db_handler.get_offline_question_count(
-            category=category_filter,
-            difficulty=difficulty,
-            language=language,
-            exclude_used=False  # Include all questions
-        )
-
-        # Check unused questions with filters
-        unused_questions = db_handler.get_offline_question_count(
-            category=category_filter,
-            difficulty=difficulty,
-            language=language,
-            exclude_used=True
+        total_questions, unused_questions, total_any, unused_any = _offline_status_counts(
+            category_filter, difficulty, language
         )
 
-        # If none available for the selected difficulty, try any difficulty as a fallback
-        total_any = total_questions
-        unused_any = unused_questions
-        if unused_questions == 0:
-            total_any = db_handler.get_offline_question_count(
-                category=category_filter,
-                difficulty=None,
-                language=language,
-                exclude_used=False
-            )
-            unused_any = db_handler.get_offline_question_count(
-                category=category_filter,
-                difficulty=None,
-                language=language,
-                exclude_used=True
-            )
-
         # Offline is available if we have unused questions for this specific combination
         # or at least some for any difficulty (to allow graceful fallback)
         offline_available = (unused_questions > 0) or (unused_any > 0)
 
-        return jsonify({
+        return ojsonify({
             'offline_available': offline_available,
             'total_questions': total_questions,
             'unused_questions': unused_questions,
@@ -1783,7 +1923,7 @@ def get_offline_status():
 
     except Exception as e:
         logger.error(f"Error getting offline status: {e}")
-        return jsonify({
+        return ojsonify({
             'error': 'Failed to get offline status',
             'offline_available': False,
             'total_questions': 0,
@@ -1793,37 +1933,19 @@ def get_offline_status():
 @app.route('/api/offline-new-round', methods=['POST'])
 def handle_offline_new_round():
     """Handle starting a new round in offline mode"""
+    session_id = session.get('game_session_id')
+    game_session = _require_session(session_id)
+    if game_session is None:
+        return no_session_response()
+    data = get_json_fast()
+    language = data.get('language', 'en')
+    category = data.get('category', '')
+    difficulty_name = data.get('difficulty', 'normal')
+    
     try:
-        session_id = session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
-        
-        game_session = active_sessions[session_id]
-        data = request.get_json()
-        language = data.get('language', 'en')
-        category = data.get('category', '')
-        difficulty_name = data.get('difficulty', 'normal')
-        
         # Localize category for DB filtering
         db_category = _localize_category_for_db(category if category else None, language)
 
-        # Check if we have any offline questions available (include used questions)
-        total_questions = db_handler.get_offline_question_count(
-            category=db_category,
-            difficulty=difficulty_name,
-            language=language,
-            exclude_used=False  # Allow both used and unused questions
-        )
-        
-        if total_questions == 0:
-            # Set language for translations
-            lang_manager.set_language(language)
-            return jsonify({
-                'error': lang_manager.get_text('no_offline_questions'),
-                'message': lang_manager.get_text('no_offline_questions_short'),
-                'available_questions': 0
-            }), 404
-        
         # Get a random question from database (include used questions)
         question_data = db_handler.get_random_offline_question(
             category=db_category,
@@ -1842,7 +1964,21 @@ def handle_offline_new_round():
             )
         
         if not question_data:
-            return jsonify({
+            # Only count when nothing was found, to pick the right error
+            total_questions, _ = db_handler.get_offline_question_counts(
+                category=db_category,
+                difficulty=None,
+                language=language
+            )
+            if total_questions == 0:
+                # Cached per-language manager; the shared lang_manager is not switched per request
+                request_lang_manager, _ = _request_managers(language)
+                return ojsonify({
+                    'error': request_lang_manager.get_text('no_offline_questions'),
+                    'message': request_lang_manager.get_text('no_offline_questions_short'),
+                    'available_questions': 0
+                }), 404
+            return ojsonify({
                 'error': 'No offline question found',
                 'message': 'Unable to retrieve new question from database.',
                 'available_questions': total_questions
@@ -1853,11 +1989,7 @@ def handle_offline_new_round():
         # db_handler.mark_question_as_used(question_data['id'])
         
         # Find difficulty level
-        difficulty = DifficultyLevel.NORMAL  # default
-        for level in DifficultyLevel.get_all_levels():
-            if level['name'] == difficulty_name:
-                difficulty = level
-                break
+        difficulty = _get_difficulty_level(difficulty_name)
         
         # Use the question data from database
         item_name = question_data['item_name']
@@ -1874,7 +2006,7 @@ def handle_offline_new_round():
             question_data['id']  # Use database ID as question_id
         )
         
-        return jsonify({
+        return ojsonify({
             'session_id': session_id,
             'category': category_used,
             'subcategory': subcategory,
@@ -1882,14 +2014,13 @@ def handle_offline_new_round():
             'facts_available': len(facts),
             'difficulty': difficulty_name,
             'mode': 'offline',
-            'total_offline_questions': total_questions,
             'question_id': question_data['id'],
             'game_complete': game_session.is_game_complete()
         })
         
     except Exception as e:
         logger.error(f"Error starting offline new round: {e}")
-        return jsonify({
+        return ojsonify({
             'error': 'Failed to start offline new round',
             'message': str(e)
         }), 500
@@ -1899,28 +2030,28 @@ def get_question_analytics():
     """Get analytics on generated questions"""
     try:
         # Simplified analytics - just return basic info
-        return jsonify({
+        return ojsonify_compressed({
             'questions': [],
             'total_count': 0,
             'message': 'Analytics feature not fully implemented yet'
         })
     except Exception as e:
         logger.error(f"Error getting question analytics: {e}")
-        return jsonify({'error': 'Failed to retrieve question analytics'}), 500
+        return ojsonify({'error': 'Failed to retrieve question analytics'}), 500
 
 @app.route('/api/analytics/categories')
 def get_category_analytics():
     """Get analytics by category and subcategory"""
     try:
         # Simplified analytics - just return basic info
-        return jsonify({
+        return ojsonify_compressed({
             'categories': [],
             'total_categories': 0,
             'message': 'Analytics feature not fully implemented yet'
         })
     except Exception as e:
         logger.error(f"Error getting category analytics: {e}")
-        return jsonify({'error': 'Failed to retrieve category analytics'}), 500
+        return ojsonify({'error': 'Failed to retrieve category analytics'}), 500
 
 @app.route('/api/analytics/database_status')
 def get_database_status():
@@ -1939,10 +2070,10 @@ def get_database_status():
                 'offline_questions_available': offline_count
             }
         
-        return jsonify(status)
+        return ojsonify(status)
     except Exception as e:
         logger.error(f"Error checking database status: {e}")
-        return jsonify({
+        return ojsonify({
             'connected': False,
             'message': f'Database error: {str(e)}',
             'error': str(e)
@@ -1952,38 +2083,33 @@ def get_database_status():
 def handle_end_session():
     """End a game session and save it to the database"""
     try:
-        data = request.get_json()
+        data = get_json_fast()
         session_id = data.get('session_id') or session.get('game_session_id')
-        if not session_id or session_id not in active_sessions:
-            return jsonify({'error': NO_ACTIVE_SESSION_ERROR}), 400
-        
-        game_session = active_sessions[session_id]
-        
-        # Save the session to database if there are any completed rounds
-        if game_session.rounds:
-            success = save_session_to_db(game_session)
-            if success:
-                logger.info(f"Session ended and saved for {game_session.player_name}")
-            else:
-                logger.warning(f"Failed to save session for {game_session.player_name}")
+        # Remove the session up front so a concurrent end request cannot save it twice
+        game_session = active_sessions.pop(session_id) if session_id else None
+        if game_session is None:
+            return no_session_response()
         
-        # Remove the session from active sessions
-        del active_sessions[session_id]
+        # Save the session in the background if any rounds finished since the last save;
+        # it is already out of active_sessions, so nothing else touches it
+        if game_session._dirty_rounds:
+            _session_save_executor.submit(_save_ended_session, game_session, datetime.now())
         
         # Clear session data
         if 'game_session_id' in session:
             session.pop('game_session_id', None)
         
-        return jsonify({
+        return ojsonify({
             'message': 'Session ended successfully',
             'total_score': game_session.total_score,
-            'rounds_completed': len(game_session.rounds),
-            'session_saved': bool(game_session.rounds)
+            'rounds_completed': game_session.rounds_completed,
+            # The save runs in the background, so only report whether one was queued
+            'session_save_queued': bool(game_session._dirty_rounds)
         })
         
     except Exception as e:
         logger.error(f"Error ending session: {e}")
-        return jsonify({'error': 'Failed to end session'}), 500
+        return ojsonify({'error': 'Failed to end session'}), 500
 
 if __name__ == '__main__':
     # Create templates and static directories
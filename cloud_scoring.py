@@ -3,23 +3,94 @@ Enhanced scoring system with PostgreSQL integration for the AI-Powered Guessing
 Provides fallback to local JSON if PostgreSQL is unavailable.
 """
 import os
+import bisect
 import logging
+import threading
 from typing import List, Dict, Optional, Any
+from cachetools import TTLCache
 from scoring import GameSession, ScoreKeeper as LocalScoreKeeper
 from postgresql_db import PostgreSQLHandler
 
+LEADERBOARD_CACHE_TTL = 30  # Seconds leaderboard query results are reused between saves
+PLAYER_STATS_CACHE_TTL = 15  # Seconds a rendered player profile is reused between saves
+PLAYER_STATS_CACHE_SIZE = 128
+
+# Grade lookup tables for _calculate_grade (bisect instead of if/elif ladders)
+_TIME_BREAKS = (20, 30, 45, 60)  # avg seconds per round; each bound belongs to the faster band
+_TIME_FACTORS = (1.2, 1.1, 1.0, 0.9, 0.8)
+_GRADE_THRESHOLDS = (200, 300, 400, 500, 600, 700, 800)  # minimum time-adjusted avg points
+_GRADE_LABELS = ("F", "D", "C", "C+", "B", "B+", "A", "A+")
+
+# Display templates, built once at import; render paths only fill in the values
+_LEADERBOARD_SEPARATOR = '=' * 50
+_PLAYER_STATS_SEPARATOR = '=' * 40
+
+_CLOUD_HEADER_PL = "\n{title} 🌍\n" + _LEADERBOARD_SEPARATOR + "\n\n🥇 Najlepsze Sesje (Globalnie):\n"
+_CLOUD_HEADER_EN = "\n{title} 🌍\n" + _LEADERBOARD_SEPARATOR + "\n\n🥇 Top Sessions (Worldwide):\n"
+_CLOUD_HEADER_EN_DEFAULT = _CLOUD_HEADER_EN.format(title="🏆 GLOBAL LEADERBOARD")
+
+_GLOBAL_STATS_PL = """
+🌍 Globalne Statystyki:
+   🏆 Najlepsza Sesja: {best_session:,} punktów
+   ⭐ Najlepsza Runda: {best_round:,} punktów
+   ⚡ Najszybsza Runda: {fastest:.1f}s
+   📊 Ogólne Statystyki: {wins}/{games} ({win_pct:.1f}% wygranych)
+"""
+_GLOBAL_STATS_EN = """
+🌍 Global Statistics:
+   🏆 Best Session: {best_session:,} points
+   ⭐ Best Round: {best_round:,} points
+   ⚡ Fastest Round: {fastest}
+   📊 Overall Stats: {wins}/{games} ({win_pct:.1f}% wins)
+"""
+
+_LEADERBOARD_ROW_EN = "📅 {date} | 👤 {player_name} | 🎯 {score:,} pts | 📊 {wins}/{rounds} wins | 🏆 Grade {grade}"
+_RECENT_ROW_PL = "   {i}. 📅 {date} | 🎯 {score:,} pkt | 📊 {wins}/{rounds} wygranych | 🏆 Ocena {grade}\n"
+_RECENT_ROW_EN = "   {i}. 📅 {date} | 🎯 {score:,} pts | 📊 {wins}/{rounds} wins | 🏆 Grade {grade}\n"
+
+_NO_PLAYER_DATA_PL = "👤 Brak danych dla gracza: {}"
+_NO_PLAYER_DATA_EN = "👤 No data found for player: {}"
+
+_PLAYER_STATS_HEADER_PL = """
+👤 Statystyki Gracza: {player_name}
+""" + _PLAYER_STATS_SEPARATOR + """
+🎯 Łączny Wynik: {total_score:,} punktów
+📊 Współczynnik Wygranych: {win_rate:.1f}% ({total_wins}/{total_rounds})
+⭐ Najlepszy Wynik: {best_score:,} punktów
+🎮 Ostatnie Sesje: {session_count}
+
+📋 Ostatnie Gry:
+"""
+_PLAYER_STATS_HEADER_EN = """
+👤 Player Stats: {player_name}
+""" + _PLAYER_STATS_SEPARATOR + """
+🎯 Total Score: {total_score:,} points
+📊 Win Rate: {win_rate:.1f}% ({total_wins}/{total_rounds})
+⭐ Best Score: {best_score:,} points
+🎮 Recent Sessions: {session_count}
+
+📋 Recent Games:
+"""
+
 class CloudScoreKeeper:
     """Enhanced score keeper with PostgreSQL integration and local fallback."""
     
-    def __init__(self):
-        """Initialize with PostgreSQL and local fallback."""
-        self.postgres_handler = PostgreSQLHandler()
+    def __init__(self, postgres_handler: Optional[PostgreSQLHandler] = None):
+        """Initialize with PostgreSQL and local fallback (reusing the caller's handler if given)."""
+        self.postgres_handler = postgres_handler or PostgreSQLHandler()
         self.local_keeper = LocalScoreKeeper()  # Fallback to local JSON
         self.use_cloud = self.postgres_handler.is_connected()
         
         # Expose scoring system for compatibility
         self.scoring_system = self.local_keeper.scoring_system
         
+        # Leaderboard query results and rendered text; saves bump the version and clear them
+        self._query_cache = TTLCache(maxsize=8, ttl=LEADERBOARD_CACHE_TTL)
+        # Rendered player profiles keyed by (player_name, language); a save drops that player's entries
+        self._player_cache = TTLCache(maxsize=PLAYER_STATS_CACHE_SIZE, ttl=PLAYER_STATS_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+        self._data_version = 0
+        
         if self.use_cloud:
             logging.debug("Using PostgreSQL for score storage")
         else:
@@ -34,6 +105,34 @@ class CloudScoreKeeper:
                 self.local_keeper.update_high_scores(session)
         else:
             self.local_keeper.update_high_scores(session)
+        self._invalidate_cache(session.player_name)
+    
+    def _invalidate_cache(self, player_name: Optional[str] = None):
+        """Drop cached leaderboard data (and the player's profile) so a newly saved session shows up right away."""
+        with self._cache_lock:
+            self._data_version += 1
+            self._query_cache.clear()
+            for key in [key for key in self._player_cache if key[0] == player_name]:
+                self._player_cache.pop(key, None)
+    
+    def _cached_query(self, key, fetch, cache=None):
+        """Return a cached query result, calling fetch() on a miss."""
+        cache = self._query_cache if cache is None else cache
+        with self._cache_lock:
+            value = cache.get(key)
+            version = self._data_version
+        if value is None:
+            value = fetch()
+            with self._cache_lock:
+                # Skip storing if a save landed while the query ran
+                if version == self._data_version:
+                    cache[key] = value
+        return value
+    
+    def _cached_top_sessions_and_stats(self, limit: int):
+        """Top sessions and global statistics from PostgreSQL (one query), cached for LEADERBOARD_CACHE_TTL seconds."""
+        return self._cached_query(('top_sessions_and_stats', limit),
+                                  lambda: self.postgres_handler.get_top_sessions_and_stats(limit))
     
     def get_top_scores_display(self, lang_manager=None) -> str:
         """Get formatted top scores display with cloud or local data."""
@@ -43,54 +142,47 @@ class CloudScoreKeeper:
             return self.local_keeper.get_top_scores_display(lang_manager)
     
     def _get_cloud_top_scores_display(self, lang_manager=None) -> str:
-        """Get top scores from PostgreSQL."""
+        """Get top scores from PostgreSQL (rendered text cached per language alongside the query results)."""
+        language = lang_manager.current_language if lang_manager else None
+        return self._cached_query(('display', language),
+                                  lambda: self._build_cloud_top_scores_display(lang_manager))
+    
+    def _build_cloud_top_scores_display(self, lang_manager=None) -> str:
+        """Render the cloud leaderboard text."""
         is_polish = bool(lang_manager and lang_manager.current_language == 'pl')
         
         # Get data from PostgreSQL
-        top_sessions = self.postgres_handler.get_top_sessions(10)
-        global_stats = self.postgres_handler.get_global_stats()
-        
-        # Format sessions
-        formatted_sessions = self._format_cloud_sessions(top_sessions)
+        top_sessions, global_stats = self._cached_top_sessions_and_stats(10)
         
-        if not formatted_sessions:
+        if not top_sessions:
             return self._get_cloud_no_scores_message(is_polish, lang_manager)
         
         # Build display components
         display = self._build_cloud_header(is_polish, lang_manager)
-        display += self._build_cloud_sessions_list(formatted_sessions, is_polish, lang_manager)
+        display += self._render_cloud_sessions(top_sessions, is_polish, lang_manager)
         display += self._build_cloud_global_stats(global_stats, is_polish)
         
         return display
     
-    def _format_cloud_sessions(self, sessions: List[Dict]) -> List[Dict]:
-        """Format session data from database to display format."""
-        formatted_sessions = []
-        for session in sessions:
+    def _render_cloud_sessions(self, sessions: List[Dict], is_polish: bool, lang_manager: Any) -> str:
+        """Render leaderboard rows straight from the database rows, in a single pass."""
+        # Pick the row renderer once; the translated template is cached by the language manager
+        render_row = lang_manager.render_session_details if is_polish and lang_manager else _LEADERBOARD_ROW_EN.format_map
+        rows = []
+        for i, session in enumerate(sessions, 1):
             rounds_won = session.get('rounds_won', 0)
-            rounds_lost = session.get('rounds_lost', 0)
-            total_rounds = rounds_won + rounds_lost
-            
-            # Extract average time from session data
-            avg_time = self._extract_session_avg_time(session.get('session_data', {}))
-            
-            formatted_session = {
-                'date': session['start_time'].isoformat() if session.get('start_time') else '',
+            total_rounds = rounds_won + session.get('rounds_lost', 0)
+            score = session.get('total_score', 0)
+            row = render_row({
+                'date': session.get('date_str', ''),
                 'player_name': session.get('player_name', 'Unknown'),
-                'score': session.get('total_score', 0),
+                'score': score,
                 'wins': rounds_won,
                 'rounds': total_rounds,
-                'grade': self._calculate_grade(session.get('total_score', 0), total_rounds, avg_time)
-            }
-            formatted_sessions.append(formatted_session)
-        return formatted_sessions
-    
-    def _extract_session_avg_time(self, session_data: Dict) -> float:
-        """Extract average time from session data."""
-        if session_data and 'rounds' in session_data:
-            times = [r.get('time_taken', 0) for r in session_data['rounds'] if r.get('time_taken', 0) > 0]
-            return sum(times) / len(times) if times else 0.0
-        return 0.0
+                'grade': self._calculate_grade(score, total_rounds, session.get('avg_time', 0.0))
+            })
+            rows.append(f"   {i:2d}. {row}\n")
+        return "".join(rows)
     
     def _get_cloud_no_scores_message(self, is_polish: bool, lang_manager: Any) -> str:
         """Get no scores message for cloud display."""
@@ -101,105 +193,61 @@ class CloudScoreKeeper:
     
     def _build_cloud_header(self, is_polish: bool, lang_manager: Any) -> str:
         """Build cloud leaderboard header."""
-        if is_polish and lang_manager:
-            return f"""
-{lang_manager.get_text('top_scores_title')} 🌍
-{'=' * 50}
-
-🥇 Najlepsze Sesje (Globalnie):
-"""
-        else:
-            title = "🏆 GLOBAL LEADERBOARD 🌍"
-            if lang_manager:
-                title = lang_manager.get_text('top_scores_title') + " 🌍"
-            return f"""
-{title}
-{'=' * 50}
-
-🥇 Top Sessions (Worldwide):
-"""
-    
-    def _build_cloud_sessions_list(self, formatted_sessions: List[Dict], is_polish: bool, lang_manager: Any) -> str:
-        """Build cloud sessions list display."""
-        display = ""
-        for i, session in enumerate(formatted_sessions, 1):
-            if is_polish and lang_manager:
-                session_data = session.copy()
-                session_data['date'] = session['date'][:10]
-                display += f"   {i:2d}. {lang_manager.get_text('session_details').format(**session_data)}\n"
-            else:
-                display += f"   {i:2d}. 📅 {session['date'][:10]} | 👤 {session['player_name']} | 🎯 {session['score']:,} pts | 📊 {session['wins']}/{session['rounds']} wins | 🏆 Grade {session['grade']}\n"
-        return display
+        if not lang_manager:
+            return _CLOUD_HEADER_EN_DEFAULT
+        template = _CLOUD_HEADER_PL if is_polish else _CLOUD_HEADER_EN
+        return template.format(title=lang_manager.get_text('top_scores_title'))
     
     def _build_cloud_global_stats(self, global_stats: Dict, is_polish: bool) -> str:
         """Build cloud global statistics display."""
         if not global_stats:
             return ""
-            
+        
+        total_wins = global_stats.get('total_wins', 0)
+        total_games = global_stats.get('total_games', 0)
+        win_pct = total_wins / total_games * 100 if total_games else 0.0
+        fastest = global_stats.get('fastest_round', 0)
+        
         if is_polish:
-            return f"""
-🌍 Globalne Statystyki:
-   🏆 Najlepsza Sesja: {global_stats.get('best_session_score', 0):,} punktów
-   ⭐ Najlepsza Runda: {global_stats.get('best_round_score', 0):,} punktów
-   ⚡ Najszybsza Runda: {global_stats.get('fastest_round', 0):.1f}s
-   📊 Ogólne Statystyki: {global_stats.get('total_wins', 0)}/{global_stats.get('total_games', 0)} ({global_stats.get('total_wins', 0)/max(global_stats.get('total_games', 1), 1)*100:.1f}% wygranych)
-"""
+            template = _GLOBAL_STATS_PL
         else:
-            fastest = global_stats.get('fastest_round', float('inf'))
-            fastest_str = f"{fastest:.1f}s" if fastest and fastest != float('inf') else "N/A"
-            
-            return f"""
-🌍 Global Statistics:
-   🏆 Best Session: {global_stats.get('best_session_score', 0):,} points
-   ⭐ Best Round: {global_stats.get('best_round_score', 0):,} points
-   ⚡ Fastest Round: {fastest_str}
-   📊 Overall Stats: {global_stats.get('total_wins', 0)}/{global_stats.get('total_games', 0)} ({global_stats.get('total_wins', 0)/max(global_stats.get('total_games', 1), 1)*100:.1f}% wins)
-"""
+            # get_global_stats reports 0 when there is no timed round
+            fastest = f"{fastest:.1f}s" if fastest and fastest != float('inf') else "N/A"
+            template = _GLOBAL_STATS_EN
+        
+        return template.format(
+            best_session=global_stats.get('best_session_score', 0),
+            best_round=global_stats.get('best_round_score', 0),
+            fastest=fastest,
+            wins=total_wins,
+            games=total_games,
+            win_pct=win_pct
+        )
     
     def _calculate_grade(self, score: int, total_rounds: int = 0, avg_time: float = 0.0) -> str:
         """Calculate grade based on average points per round and average time."""
         # Calculate average points per round
         avg_points = (score / total_rounds) if total_rounds > 0 else 0
         
-        # Time factor: excellent < 20s, good < 30s, average < 45s, poor >= 45s
-        # Time bonus threshold in scoring system is 30s
-        if avg_time <= 20:
-            time_factor = 1.2  # 20% bonus for very fast responses
-        elif avg_time <= 30:
-            time_factor = 1.1  # 10% bonus for fast responses (time bonus threshold)
-        elif avg_time <= 45:
-            time_factor = 1.0  # No bonus/penalty for reasonable time
-        elif avg_time <= 60:
-            time_factor = 0.9  # 10% penalty for slow responses
-        else:
-            time_factor = 0.8  # 20% penalty for very slow responses
+        # Time factor: excellent <= 20s, good <= 30s, average <= 45s, slow <= 60s, very slow beyond
+        # (time bonus threshold in scoring system is 30s)
+        time_factor = _TIME_FACTORS[bisect.bisect_left(_TIME_BREAKS, avg_time)]
         
-        # Apply time factor to average points
-        adjusted_avg_points = avg_points * time_factor
-        
-        # Determine grade based on time-adjusted average points
-        if adjusted_avg_points >= 800:
-            return "A+"
-        elif adjusted_avg_points >= 700:
-            return "A"
-        elif adjusted_avg_points >= 600:
-            return "B+"
-        elif adjusted_avg_points >= 500:
-            return "B"
-        elif adjusted_avg_points >= 400:
-            return "C+"
-        elif adjusted_avg_points >= 300:
-            return "C"
-        elif adjusted_avg_points >= 200:
-            return "D"
-        else:
-            return "F"
+        # Grade from the time-adjusted average points
+        return _GRADE_LABELS[bisect.bisect_right(_GRADE_THRESHOLDS, avg_points * time_factor)]
     
     def get_player_stats(self, player_name: str, lang_manager=None) -> str:
         """Get statistics for a specific player."""
         if not self.use_cloud:
             return "Player statistics require cloud database connection."
         
+        language = lang_manager.current_language if lang_manager else None
+        return self._cached_query((player_name, language),
+                                  lambda: self._build_player_stats_display(player_name, lang_manager),
+                                  self._player_cache)
+    
+    def _build_player_stats_display(self, player_name: str, lang_manager=None) -> str:
+        """Render the player statistics text from PostgreSQL."""
         is_polish = bool(lang_manager and lang_manager.current_language == 'pl')
         sessions = self.postgres_handler.get_player_sessions(player_name, 5)
         
@@ -218,10 +266,7 @@ class CloudScoreKeeper:
     
     def _get_no_player_data_message(self, player_name: str, is_polish: bool) -> str:
         """Get message when no player data is found."""
-        if is_polish:
-            return f"👤 Brak danych dla gracza: {player_name}"
-        else:
-            return f"👤 No data found for player: {player_name}"
+        return (_NO_PLAYER_DATA_PL if is_polish else _NO_PLAYER_DATA_EN).format(player_name)
     
     def _format_player_sessions(self, sessions: List[Dict]) -> List[Dict]:
         """Format player sessions for display."""
@@ -231,65 +276,49 @@ class CloudScoreKeeper:
             rounds_lost = session.get('rounds_lost', 0)
             total_rounds = rounds_won + rounds_lost
             
-            avg_time = self._extract_session_avg_time(session.get('session_data', {}))
-            
             formatted_session = {
-                'date': session['start_time'].isoformat() if session.get('start_time') else '',
+                'date': session.get('date_str', ''),
                 'score': session.get('total_score', 0),
                 'wins': rounds_won,
                 'rounds': total_rounds,
-                'grade': self._calculate_grade(session.get('total_score', 0), total_rounds, avg_time)
+                'grade': self._calculate_grade(session.get('total_score', 0), total_rounds, session.get('avg_time', 0.0))
             }
             formatted_sessions.append(formatted_session)
         return formatted_sessions
     
     def _calculate_player_stats(self, formatted_sessions: List[Dict]) -> Dict:
         """Calculate player statistics from sessions."""
+        # Single pass over the sessions instead of one sum()/max() per field
+        total_score = total_wins = total_rounds = 0
+        best_score = formatted_sessions[0]['score']
+        for s in formatted_sessions:
+            score = s['score']
+            total_score += score
+            total_wins += s['wins']
+            total_rounds += s['rounds']
+            if score > best_score:
+                best_score = score
         return {
-            'total_score': sum(s['score'] for s in formatted_sessions),
-            'total_wins': sum(s['wins'] for s in formatted_sessions),
-            'total_rounds': sum(s['rounds'] for s in formatted_sessions),
-            'best_score': max(s['score'] for s in formatted_sessions),
+            'total_score': total_score,
+            'total_wins': total_wins,
+            'total_rounds': total_rounds,
+            'best_score': best_score,
             'session_count': len(formatted_sessions)
         }
     
     def _build_player_stats_header(self, player_name: str, stats: Dict, is_polish: bool) -> str:
         """Build player statistics header."""
         win_rate = (stats['total_wins'] / stats['total_rounds'] * 100) if stats['total_rounds'] > 0 else 0
-        
-        if is_polish:
-            return f"""
-👤 Statystyki Gracza: {player_name}
-{'=' * 40}
-🎯 Łączny Wynik: {stats['total_score']:,} punktów
-📊 Współczynnik Wygranych: {win_rate:.1f}% ({stats['total_wins']}/{stats['total_rounds']})
-⭐ Najlepszy Wynik: {stats['best_score']:,} punktów
-🎮 Ostatnie Sesje: {stats['session_count']}
-
-📋 Ostatnie Gry:
-"""
-        else:
-            return f"""
-👤 Player Stats: {player_name}
-{'=' * 40}
-🎯 Total Score: {stats['total_score']:,} points
-📊 Win Rate: {win_rate:.1f}% ({stats['total_wins']}/{stats['total_rounds']})
-⭐ Best Score: {stats['best_score']:,} points
-🎮 Recent Sessions: {stats['session_count']}
-
-📋 Recent Games:
-"""
+        template = _PLAYER_STATS_HEADER_PL if is_polish else _PLAYER_STATS_HEADER_EN
+        return template.format(player_name=player_name, win_rate=win_rate, **stats)
     
     def _build_recent_sessions_list(self, formatted_sessions: List[Dict], is_polish: bool) -> str:
         """Build recent sessions list display."""
-        display = ""
-        for i, session in enumerate(formatted_sessions, 1):
-            date_str = session['date'][:10] if len(session['date']) > 10 else session['date']
-            if is_polish:
-                display += f"   {i}. 📅 {date_str} | 🎯 {session['score']:,} pkt | 📊 {session['wins']}/{session['rounds']} wygranych | 🏆 Ocena {session['grade']}\n"
-            else:
-                display += f"   {i}. 📅 {date_str} | 🎯 {session['score']:,} pts | 📊 {session['wins']}/{session['rounds']} wins | 🏆 Grade {session['grade']}\n"
-        return display
+        row_template = _RECENT_ROW_PL if is_polish else _RECENT_ROW_EN
+        return "".join(
+            row_template.format(i=i, **session)
+            for i, session in enumerate(formatted_sessions, 1)
+        )
 
     def get_score_summary(self, session: GameSession, lang_manager=None) -> str:
         """Get formatted score summary with language support."""
@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for production (Azure App Service runs gunicorn from the app
+directory, which loads this file automatically).
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Active game sessions live in process memory (app.active_sessions), so requests for a
+# session must reach the same process: run one worker and get concurrency from threads.
+# Threads block on Azure OpenAI and PostgreSQL I/O with the GIL released; keep the thread
+# count within DB_POOL_MAX_CONN so every thread can hold a pooled connection.
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+# Round generation can wait ~30s on Azure OpenAI before falling back to the database, so
+# allow well over that before a silent worker is restarted; give in-flight requests and
+# background session saves time to finish on restart/deploy.
+timeout = 60
+graceful_timeout = 30
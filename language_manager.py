@@ -3,8 +3,41 @@ Language management system for the guessing game.
 Supports multiple languages with easy translation management.
 """
 
-import json
+import functools
 import os
+import orjson
+
+
+class _MissingField:
+    """Stands in for a missing format field and renders it back as '{name[:spec]}'."""
+    __slots__ = ('name',)
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __format__(self, spec):
+        return f"{{{self.name}:{spec}}}" if spec else f"{{{self.name}}}"
+    
+    def __str__(self):
+        # '{name!s}' / '{name!r}' convert before formatting; the placeholder comes back without the conversion
+        return f"{{{self.name}}}"
+    
+    __repr__ = __str__
+
+
+class _SafeFormatDict(dict):
+    """format_map() mapping that leaves unknown placeholders in place instead of raising KeyError."""
+    
+    def __missing__(self, key):
+        return _MissingField(key)
+
+
+@functools.cache
+def _load_languages_file(filename):
+    """Parse a languages file once per process; LanguageManager instances share the result read-only."""
+    with open(filename, 'rb') as f:
+        return orjson.loads(f.read())
+
 
 class LanguageManager:
     """Manages game translations and language switching."""
@@ -13,23 +46,28 @@ class LanguageManager:
         """Initialize the language manager."""
         self.languages = {}
         self.current_language = "en"  # Default to English
+        self.is_english = True  # Cached `current_language == 'en'`, kept in sync by set_language
         self.translations = {}
+        # Command matchers for the current language, rebuilt by set_language
+        self._quit_commands = frozenset()
+        self._yes_commands = frozenset()
+        self._list_command = 'list_command'
+        self._session_details = 'session_details'  # Leaderboard row template, rendered per session
         self.load_languages(languages_file)
     
     def load_languages(self, filename):
         """Load language definitions from JSON file."""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.languages = data.get('languages', {})
-                
-                # Set default language if available
-                if 'en' in self.languages:
-                    self.set_language('en')
-                elif self.languages:
-                    # Set first available language
-                    self.set_language(list(self.languages.keys())[0])
-                    
+            data = _load_languages_file(filename)
+            self.languages = data.get('languages', {})
+            
+            # Set default language if available
+            if 'en' in self.languages:
+                self.set_language('en')
+            elif self.languages:
+                # Set first available language
+                self.set_language(list(self.languages.keys())[0])
+            
         except FileNotFoundError:
             # Fallback to English if file not found
             self.languages = {
@@ -52,7 +90,12 @@ class LanguageManager:
         """Set the current language."""
         if language_code in self.languages:
             self.current_language = language_code
+            self.is_english = language_code == 'en'
             self.translations = self.languages[language_code]['translations']
+            self._quit_commands = frozenset(c.lower() for c in self.get_list('quit_commands'))
+            self._yes_commands = frozenset(c.lower() for c in self.get_list('yes_commands'))
+            self._list_command = self.get_text('list_command').lower()
+            self._session_details = self.get_text('session_details')
             return True
         return False
     
@@ -71,19 +114,20 @@ class LanguageManager:
         """Get translated text for a key with optional formatting."""
         text = self.translations.get(key, key)
         if kwargs:
-            try:
-                return text.format(**kwargs)
-            except KeyError:
-                return text
+            return text.format_map(_SafeFormatDict(kwargs))
         return text
     
+    def render_session_details(self, fields):
+        """Render one leaderboard row from a mapping with the current language's session_details template."""
+        return self._session_details.format_map(fields)
+    
     def get_list(self, key):
         """Get a list of strings for a key."""
         return self.translations.get(key, [])
     
     def translate_category_example(self, example):
         """Translate a category example to current language."""
-        if self.current_language == 'en':
+        if self.is_english:
             return example
         
         category_examples = self.translations.get('category_examples', {})
@@ -91,18 +135,15 @@ class LanguageManager:
     
     def is_quit_command(self, command):
         """Check if command is a quit command in current language."""
-        quit_commands = self.get_list('quit_commands')
-        return command.lower() in quit_commands
+        return command.lower() in self._quit_commands
     
     def is_yes_command(self, command):
         """Check if command is a yes command in current language."""
-        yes_commands = self.get_list('yes_commands')
-        return command.lower() in yes_commands
+        return command.lower() in self._yes_commands
     
     def is_list_command(self, command):
         """Check if command is a list command in current language."""
-        list_command = self.get_text('list_command')
-        return command.lower() == list_command.lower()
+        return command.lower() == self._list_command
     
     def show_language_selection(self):
         """Display language selection menu."""
@@ -2,32 +2,225 @@
 PostgreSQL database handler for the AI-Powered Guessing Game
 Provides direct connection to Supabase PostgreSQL using psycopg2.
 """
+import io
 import os
 import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Tuple, Union, Any
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Schema bootstrap tables, sent as one multi-statement query (every statement is idempotent)
+_SCHEMA_DDL = """
+-- Create game_sessions table
+CREATE TABLE IF NOT EXISTS game_sessions (
+    id SERIAL PRIMARY KEY,
+    player_name VARCHAR(255) NOT NULL,
+    start_time TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    end_time TIMESTAMP WITH TIME ZONE,
+    total_score INTEGER DEFAULT 0,
+    rounds_won INTEGER DEFAULT 0,
+    rounds_lost INTEGER DEFAULT 0,
+    session_data JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create generated_questions table
+CREATE TABLE IF NOT EXISTS generated_questions (
+    id SERIAL PRIMARY KEY,
+    item_name VARCHAR(255) NOT NULL,
+    category VARCHAR(100),
+    subcategory VARCHAR(100),
+    difficulty VARCHAR(50),
+    facts JSONB,
+    language VARCHAR(10) DEFAULT 'en',
+    session_id VARCHAR(255),
+    player_name VARCHAR(255),
+    ai_model VARCHAR(100),
+    generation_time_ms INTEGER,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    used_in_round BOOLEAN DEFAULT FALSE,
+    random_key DOUBLE PRECISION NOT NULL DEFAULT random(),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create game_rounds table with comprehensive tracking
+CREATE TABLE IF NOT EXISTS game_rounds (
+    id SERIAL PRIMARY KEY,
+    session_id INTEGER,
+    question_id INTEGER,
+    player_name VARCHAR(255) NOT NULL,
+    item_name VARCHAR(255) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    subcategory VARCHAR(100),
+    difficulty VARCHAR(50) DEFAULT 'normal',
+    language VARCHAR(10) DEFAULT 'en',
+    facts_revealed INTEGER DEFAULT 0,
+    total_facts INTEGER DEFAULT 5,
+    hints_used INTEGER DEFAULT 0,
+    max_hints INTEGER DEFAULT 3,
+    guessed_correctly BOOLEAN DEFAULT FALSE,
+    guess_attempts INTEGER DEFAULT 0,
+    final_guess VARCHAR(500),
+    all_guesses TEXT,
+    similarity_score DECIMAL(5,4) DEFAULT 0.0,
+    match_type VARCHAR(50),
+    time_taken DECIMAL(10,3) DEFAULT 0.0,
+    round_score INTEGER DEFAULT 0,
+    base_score INTEGER DEFAULT 0,
+    score_multiplier DECIMAL(3,2) DEFAULT 1.0,
+    gave_up BOOLEAN DEFAULT FALSE,
+    auto_revealed BOOLEAN DEFAULT FALSE,
+    game_mode VARCHAR(20) DEFAULT 'online',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    FOREIGN KEY (session_id) REFERENCES game_sessions(id) ON DELETE SET NULL,
+    FOREIGN KEY (question_id) REFERENCES generated_questions(id) ON DELETE SET NULL
+);
+
+"""
+# Indexes for better performance, built with CREATE INDEX CONCURRENTLY so writes aren't blocked
+_SCHEMA_INDEXES = (
+    ('idx_game_sessions_player_name', 'game_sessions(player_name)'),
+    ('idx_game_sessions_total_score', 'game_sessions(total_score DESC)'),
+    ('idx_game_sessions_start_time', 'game_sessions(start_time DESC)'),
+    ('idx_generated_questions_item_name', 'generated_questions(item_name)'),
+    ('idx_generated_questions_category', 'generated_questions(category)'),
+    # Matches the case-insensitive category + language lookups; random_key lets a random pick seek instead of sort
+    ('idx_generated_questions_category_language_random', 'generated_questions(LOWER(category), language, random_key)'),
+    ('idx_generated_questions_subcategory', 'generated_questions(subcategory)'),
+    ('idx_generated_questions_difficulty', 'generated_questions(difficulty)'),
+    ('idx_generated_questions_session_id', 'generated_questions(session_id)'),
+    ('idx_generated_questions_player_name', 'generated_questions(player_name)'),
+    ('idx_game_rounds_session_id', 'game_rounds(session_id)'),
+    ('idx_game_rounds_question_id', 'game_rounds(question_id)'),
+    ('idx_game_rounds_player_name', 'game_rounds(player_name)'),
+    ('idx_game_rounds_category', 'game_rounds(category)'),
+)
+
+def _as_round_dict(round_obj, player_name: str) -> Dict[str, Any]:
+    """Normalize a session round (history dict or GameRound) to the game_rounds insert payload."""
+    if isinstance(round_obj, dict):
+        # Round history entry recorded by the web session
+        guesses = round_obj.get('guesses') or []
+        return {
+            'player_name': player_name,
+            'item_name': round_obj.get('word', ''),
+            'category': round_obj.get('category', ''),
+            'subcategory': round_obj.get('subcategory', ''),
+            'difficulty': round_obj.get('difficulty', 'normal'),
+            'language': round_obj.get('language', 'en'),
+            'facts_revealed': round_obj.get('facts_shown', 0),
+            'total_facts': round_obj.get('total_facts', 5),
+            'guessed_correctly': round_obj.get('won', False),
+            'guess_attempts': len(guesses),
+            'final_guess': guesses[-1] if guesses else '',
+            'similarity_score': round_obj.get('similarity_score', 0.0),
+            'match_type': round_obj.get('match_type', ''),
+            'time_taken': round_obj.get('time_taken', 0.0),
+            'round_score': round_obj.get('score', 0)
+        }
+    # GameRound object
+    return {
+        'player_name': player_name,
+        'item_name': round_obj.item_name,
+        'category': round_obj.category,
+        'subcategory': round_obj.subcategory,
+        'difficulty': getattr(round_obj, 'difficulty', 'normal'),
+        'language': getattr(round_obj, 'language', 'en'),
+        'facts_revealed': round_obj.facts_shown,
+        'total_facts': round_obj.total_facts,
+        'guessed_correctly': round_obj.correct,
+        'guess_attempts': round_obj.guess_attempts,
+        'final_guess': getattr(round_obj, 'final_guess', ''),
+        'similarity_score': round_obj.similarity_score,
+        'match_type': round_obj.match_type,
+        'time_taken': round_obj.time_taken,
+        'round_score': round_obj.round_score,
+        'hints_used': getattr(round_obj, 'hints_used', 0),
+        'question_id': getattr(round_obj, 'question_id', None)
+    }
+
+
 class PostgreSQLHandler:
     """Direct PostgreSQL connection handler for Supabase."""
     
     # Constants to avoid duplication
     _CONNECTION_TEST_SQL = "SELECT 1"
     _CATEGORY_FILTER_SQL = " AND LOWER(category) = LOWER(%s)"
+    _CONNECTION_CHECK_TTL = 10.0  # Seconds a successful SELECT 1 probe is trusted
+    _RECONNECT_BACKOFF_MIN = 1.0  # Seconds before the first reconnect attempt after a failure
+    _RECONNECT_BACKOFF_MAX = 60.0  # Cap for the doubling delay between reconnect attempts
+    # Hot single-row INSERTs, run as per-connection prepared statements (see _execute_prepared)
+    _INSERT_SESSION_SQL = """
+        INSERT INTO game_sessions 
+        (player_name, start_time, end_time, total_score, rounds_won, rounds_lost)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """
+    _INSERT_ROUND_SQL = """
+        INSERT INTO game_rounds 
+        (session_id, question_id, player_name, item_name, category, subcategory, 
+         difficulty, language, facts_revealed, total_facts, hints_used, max_hints,
+         guessed_correctly, guess_attempts, final_guess, all_guesses, 
+         similarity_score, match_type, time_taken, round_score, base_score, 
+         score_multiplier, gave_up, auto_revealed, game_mode)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """
+    # game_rounds columns in _round_row() order, for COPY; sessions with this many rounds use it
+    _ROUND_COLUMNS = (
+        'session_id', 'question_id', 'player_name', 'item_name', 'category', 'subcategory',
+        'difficulty', 'language', 'facts_revealed', 'total_facts', 'hints_used', 'max_hints',
+        'guessed_correctly', 'guess_attempts', 'final_guess', 'all_guesses',
+        'similarity_score', 'match_type', 'time_taken', 'round_score', 'base_score',
+        'score_multiplier', 'gave_up', 'auto_revealed', 'game_mode'
+    )
+    _COPY_MIN_ROUNDS = 4
+    _SCHEMA_LOCK_ID = 8462837  # pg_try_advisory_lock key held while one instance builds indexes
+    _schema_bootstrapped = False  # Set once any handler in this process has created/migrated the schema
+    # TCP keepalives so idle pooled connections aren't silently dropped by NATs/load balancers
+    _KEEPALIVE_PARAMS = {'keepalives': 1, 'keepalives_idle': 30, 'keepalives_interval': 10, 'keepalives_count': 5}
+    # Display date (YYYY-MM-DD) formatted once by the server instead of per row in Python
+    _DATE_STR_COLUMN = "COALESCE(to_char(start_time, 'YYYY-MM-DD'), '') AS date_str"
+    # Average positive time_taken over a session's game_rounds rows, computed by the server
+    _AVG_TIME_COLUMN = """
+        COALESCE((
+            SELECT AVG(gr.time_taken)::float8
+            FROM game_rounds gr
+            WHERE gr.session_id = game_sessions.id AND gr.time_taken > 0
+        ), 0) AS avg_time"""
     
     def __init__(self):
         """Initialize PostgreSQL connection."""
         # Use simple assignments here to avoid introspection/type-annotation issues
-        self.connection = None
+        self.connection = None  # Bootstrap connection used for setup, migrations and health probes
+        self._pool = None  # Shared by request threads so queries don't serialize on one connection
         self.is_connected_flag = False
         self._connect_attempted = False
+        self._last_probe_ok = 0.0  # time.monotonic() of the last successful probe
+        self._conn_params = None  # Parameters of the working connection, reused to reconnect
+        self._retry_at = 0.0  # time.monotonic() before which a failed connection isn't retried
+        self._reconnect_backoff = self._RECONNECT_BACKOFF_MIN
+        self._reconnect_lock = threading.Lock()
+        self._use_prepared = True  # Off behind a transaction pooler, where server sessions aren't ours
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> names PREPAREd on it
+        self._prepared_lock = threading.Lock()
         self._setup_logging()
         # Defer connecting until first use to avoid blocking app startup
         # The actual connection will be attempted lazily in is_connected() or other methods
@@ -66,18 +259,15 @@ class PostgreSQLHandler:
             
         self.logger.debug("Using DATABASE_URL for connection")
         try:
-            self.connection = psycopg2.connect(
-                database_url,
-                sslmode='require',
-                connect_timeout=10
-            )
+            conn_params = {'dsn': database_url, 'sslmode': 'require', 'connect_timeout': 10, **self._KEEPALIVE_PARAMS}
+            self.connection = psycopg2.connect(**conn_params)
             self.connection.autocommit = True
             
             if self._test_connection():
                 self.is_connected_flag = True
                 self.logger.debug("Successfully connected to PostgreSQL database using DATABASE_URL")
-                self._ensure_tables_exist()
-                self._run_migrations()
+                self._bootstrap_schema()
+                self._init_pool(conn_params)
                 return True
                         
         except psycopg2.Error as e:
@@ -97,8 +287,9 @@ class PostgreSQLHandler:
         host_formats = self._get_supabase_hosts(supabase_url)
         base_params = self._get_supabase_connection_params(supabase_password)
         
-        for host in host_formats:
-            if self._try_host_connection(host, base_params):
+        if host_formats:
+            host, connection = self._probe_hosts(host_formats, base_params)
+            if connection and self._use_host_connection(host, connection, base_params):
                 return
         
         # If we get here, all connection attempts failed
@@ -151,31 +342,142 @@ class PostgreSQLHandler:
             'password': supabase_password,
             'port': 5432,
             'sslmode': 'require',
-            'connect_timeout': 10
+            'connect_timeout': 10,
+            **self._KEEPALIVE_PARAMS
         }
     
-    def _try_host_connection(self, host, base_params):
-        """Try to connect to a specific host."""
+    def _probe_hosts(self, host_formats, base_params):
+        """Connect to every candidate host at once and return (host, connection) for the first that answers."""
+        # Dead hosts each cost up to connect_timeout, so probe in parallel rather than one after another
+        executor = ThreadPoolExecutor(max_workers=len(host_formats), thread_name_prefix='pg-host-probe')
+        futures = {executor.submit(self._open_connection, host, base_params): host for host in host_formats}
+        winner = (None, None)
+        try:
+            for future in as_completed(futures):
+                connection = future.result()
+                if connection is not None:
+                    winner = (futures[future], connection)
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        def close_unused(future):
+            connection = None if future.cancelled() or future.exception() else future.result()
+            if connection is not None and connection is not winner[1]:
+                connection.close()
+        
+        # Slower hosts that also connect (now or later) are closed as soon as they finish
+        for future in futures:
+            future.add_done_callback(close_unused)
+        return winner
+    
+    def _open_connection(self, host, base_params):
+        """Open an autocommit connection to host, or return None; leaves the handler untouched."""
         try:
             self.logger.debug(f"Attempting to connect to PostgreSQL at {host}")
-            
-            conn_params = {**base_params, 'host': host}
-            self.connection = psycopg2.connect(**conn_params)
-            self.connection.autocommit = True
-            
+            connection = psycopg2.connect(**base_params, host=host)
+            connection.autocommit = True
+            return connection
+        except psycopg2.Error as e:
+            self.logger.debug(f"Failed to connect to {host}: {e}")
+            return None
+    
+    def _use_host_connection(self, host, connection, base_params):
+        """Adopt a probed connection as the bootstrap connection and build the pool for its host."""
+        self.connection = connection
+        try:
             if self._test_connection():
                 self.is_connected_flag = True
                 self.logger.debug(f"Successfully connected to PostgreSQL database at {host}")
-                self._ensure_tables_exist()
-                self._run_migrations()
+                self._bootstrap_schema()
+                self._init_pool({**base_params, 'host': host})
                 return True
                 
         except psycopg2.Error as e:
             self.logger.debug(f"Failed to connect to {host}: {e}")
-            self._close_connection()
-            
+        
+        self._close_connection()
         return False
     
+    def _bootstrap_schema(self):
+        """Create tables and run migrations once per process; later connects reuse the schema."""
+        if PostgreSQLHandler._schema_bootstrapped:
+            return
+        # Idempotent DDL, so two handlers racing here at worst both run it once;
+        # a failed attempt leaves the flag unset so the next connect retries
+        # Indexes go last so they can cover columns added by migrations
+        if self._ensure_tables_exist() and self._run_migrations() and self._ensure_indexes():
+            PostgreSQLHandler._schema_bootstrapped = True
+    
+    def _init_pool(self, conn_params):
+        """Create the thread-safe connection pool used by query methods."""
+        self._conn_params = conn_params
+        min_conn = int(os.getenv('DB_POOL_MIN_CONN', '1'))
+        max_conn = int(os.getenv('DB_POOL_MAX_CONN', '16'))
+        
+        # Request queries can go through PgBouncer (transaction pool mode) while setup and
+        # migrations above stay on the direct connection
+        pool_url = os.getenv('DATABASE_POOL_URL')
+        if pool_url:
+            self.logger.debug("Using DATABASE_POOL_URL for pooled connections")
+            pool_params = {'dsn': pool_url, 'sslmode': 'require', 'connect_timeout': 10, **self._KEEPALIVE_PARAMS}
+            self._use_prepared = False
+        else:
+            pool_params = conn_params
+        try:
+            self._pool = psycopg2.pool.ThreadedConnectionPool(min_conn, max_conn, **pool_params)
+        except psycopg2.Error as e:
+            # Queries fall back to the bootstrap connection
+            self.logger.error(f"Failed to create connection pool: {e}")
+            self._pool = None
+    
+    @contextmanager
+    def _cursor(self, cursor_factory=None, transaction=False):
+        """Yield a cursor on a pooled connection, returning the connection afterwards.
+        
+        With transaction=True the statements run in one transaction that is committed when the
+        block exits and rolled back if it raises; otherwise every statement autocommits.
+        """
+        if not self._pool:
+            if transaction:
+                # The bootstrap connection is shared and autocommit, so a transaction gets its own
+                if self._conn_params is None:
+                    raise psycopg2.InterfaceError("No connection parameters for a transaction")
+                conn = psycopg2.connect(**self._conn_params)
+                try:
+                    with conn:  # Commits on exit, rolls back if the block raises
+                        with conn.cursor(cursor_factory=cursor_factory) as cursor:
+                            yield cursor
+                finally:
+                    conn.close()
+                return
+            with self._get_connection().cursor(cursor_factory=cursor_factory) as cursor:
+                yield cursor
+            return
+        
+        conn = self._pool.getconn()
+        if conn.closed:
+            # Pre-ping equivalent: replace connections the server dropped while idle
+            self._pool.putconn(conn, close=True)
+            conn = self._pool.getconn()
+        conn.autocommit = not transaction
+        broken = False
+        try:
+            with conn.cursor(cursor_factory=cursor_factory) as cursor:
+                yield cursor
+            if transaction:
+                conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            self._last_probe_ok = 0.0  # Don't trust the cached probe; the next is_connected() re-checks
+            raise
+        except BaseException:
+            if transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn, close=broken or bool(conn.closed))
+    
     def _test_connection(self):
         """Test database connection with a simple query."""
         if not self.connection:
@@ -198,157 +500,67 @@ class PostgreSQLHandler:
                 pass
             self.connection = None
     
-    def _ensure_tables_exist(self):
+    def _ensure_tables_exist(self) -> bool:
         """Create tables if they don't exist."""
         if not self.connection:
-            return
+            return False
             
         try:
             with self.connection.cursor() as cursor:
-                # Create game_sessions table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS game_sessions (
-                        id SERIAL PRIMARY KEY,
-                        player_name VARCHAR(255) NOT NULL,
-                        start_time TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        end_time TIMESTAMP WITH TIME ZONE,
-                        total_score INTEGER DEFAULT 0,
-                        rounds_won INTEGER DEFAULT 0,
-                        rounds_lost INTEGER DEFAULT 0,
-                        session_data JSONB,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                    );
-                """)
-                
-                # Create generated_questions table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS generated_questions (
-                        id SERIAL PRIMARY KEY,
-                        item_name VARCHAR(255) NOT NULL,
-                        category VARCHAR(100),
-                        subcategory VARCHAR(100),
-                        difficulty VARCHAR(50),
-                        facts JSONB,
-                        language VARCHAR(10) DEFAULT 'en',
-                        session_id VARCHAR(255),
-                        player_name VARCHAR(255),
-                        ai_model VARCHAR(100),
-                        generation_time_ms INTEGER,
-                        prompt_tokens INTEGER,
-                        completion_tokens INTEGER,
-                        used_in_round BOOLEAN DEFAULT FALSE,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                    );
-                """)
+                # Create tables in a single round trip
+                cursor.execute(_SCHEMA_DDL)
                 
-                # Create game_rounds table with comprehensive tracking
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS game_rounds (
-                        id SERIAL PRIMARY KEY,
-                        session_id INTEGER,
-                        question_id INTEGER,
-                        player_name VARCHAR(255) NOT NULL,
-                        item_name VARCHAR(255) NOT NULL,
-                        category VARCHAR(100) NOT NULL,
-                        subcategory VARCHAR(100),
-                        difficulty VARCHAR(50) DEFAULT 'normal',
-                        language VARCHAR(10) DEFAULT 'en',
-                        facts_revealed INTEGER DEFAULT 0,
-                        total_facts INTEGER DEFAULT 5,
-                        hints_used INTEGER DEFAULT 0,
-                        max_hints INTEGER DEFAULT 3,
-                        guessed_correctly BOOLEAN DEFAULT FALSE,
-                        guess_attempts INTEGER DEFAULT 0,
-                        final_guess VARCHAR(500),
-                        all_guesses TEXT,
-                        similarity_score DECIMAL(5,4) DEFAULT 0.0,
-                        match_type VARCHAR(50),
-                        time_taken DECIMAL(10,3) DEFAULT 0.0,
-                        round_score INTEGER DEFAULT 0,
-                        base_score INTEGER DEFAULT 0,
-                        score_multiplier DECIMAL(3,2) DEFAULT 1.0,
-                        gave_up BOOLEAN DEFAULT FALSE,
-                        auto_revealed BOOLEAN DEFAULT FALSE,
-                        game_mode VARCHAR(20) DEFAULT 'online',
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                        FOREIGN KEY (session_id) REFERENCES game_sessions(id) ON DELETE SET NULL,
-                        FOREIGN KEY (question_id) REFERENCES generated_questions(id) ON DELETE SET NULL
-                    );
-                """)
-                
-                # Create indexes for better performance
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_game_sessions_player_name 
-                    ON game_sessions(player_name);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_game_sessions_total_score 
-                    ON game_sessions(total_score DESC);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_game_sessions_start_time 
-                    ON game_sessions(start_time DESC);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_generated_questions_item_name 
-                    ON generated_questions(item_name);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_generated_questions_category 
-                    ON generated_questions(category);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_generated_questions_subcategory 
-                    ON generated_questions(subcategory);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_generated_questions_difficulty 
-                    ON generated_questions(difficulty);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_generated_questions_session_id 
-                    ON generated_questions(session_id);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_generated_questions_player_name 
-                    ON generated_questions(player_name);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_game_rounds_question_id 
-                    ON game_rounds(question_id);
-                """)
-                
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_game_rounds_player_name 
-                    ON game_rounds(player_name);
-                """)
+                self.logger.debug("Database tables ensured")
+                return True
                 
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_game_rounds_category 
-                    ON game_rounds(category);
-                """)
+        except psycopg2.Error as e:
+            self.logger.error(f"Error creating tables: {e}")
+            return False
+    
+    def _ensure_indexes(self) -> bool:
+        """Build missing indexes concurrently; only the instance holding the advisory lock does it."""
+        if not self.connection:
+            return False
+        
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (self._SCHEMA_LOCK_ID,))
+                if not cursor.fetchone()[0]:
+                    self.logger.debug("Another instance is building indexes, skipping")
+                    return True
                 
-                self.logger.debug("Database tables and indexes ensured")
+                try:
+                    # One lookup so a normal start issues no CREATE INDEX at all
+                    cursor.execute("""
+                        SELECT c.relname, i.indisvalid
+                        FROM pg_index i
+                        JOIN pg_class c ON c.oid = i.indexrelid
+                        WHERE c.relname = ANY(%s)
+                    """, ([name for name, _ in _SCHEMA_INDEXES],))
+                    existing = dict(cursor.fetchall())
+                    
+                    # CONCURRENTLY can't run in a transaction block, so each one is its own autocommit statement
+                    for name, target in _SCHEMA_INDEXES:
+                        if existing.get(name):
+                            continue
+                        if name in existing:
+                            # Invalid leftover of an interrupted concurrent build
+                            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                        cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+                finally:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (self._SCHEMA_LOCK_ID,))
+                
+                self.logger.debug("Database indexes ensured")
+                return True
                 
         except psycopg2.Error as e:
-            self.logger.error(f"Error creating tables: {e}")
+            self.logger.error(f"Error creating indexes: {e}")
+            return False
     
-    def _run_migrations(self):
+    def _run_migrations(self) -> bool:
         """Run database migrations to update schema."""
         if not self.connection:
-            return
+            return False
             
         try:
             with self.connection.cursor() as cursor:
@@ -374,14 +586,32 @@ class PostgreSQLHandler:
                         SET updated_at = NOW() 
                         WHERE used_in_round IS NULL
                     """)
+                
+                # Check if random_key column exists (used to pick random questions without sorting)
+                cursor.execute("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name = 'generated_questions' 
+                    AND column_name = 'random_key'
+                """)
+                
+                if not cursor.fetchone():
+                    # The volatile default gives every existing row its own key
+                    cursor.execute("""
+                        ALTER TABLE generated_questions 
+                        ADD COLUMN random_key DOUBLE PRECISION NOT NULL DEFAULT random()
+                    """)
+                    self.logger.info("Added random_key column to generated_questions table")
                     
                 self.connection.commit()
                 self.logger.debug("Database migrations completed")
+                return True
                 
         except psycopg2.Error as e:
             self.logger.error(f"Error running migrations: {e}")
             if self.connection:
                 self.connection.rollback()
+            return False
     
     def upgrade_game_rounds_table(self) -> bool:
         """Drop and recreate the game_rounds table with improved structure."""
@@ -446,20 +676,20 @@ class PostgreSQLHandler:
                     );
                 """)
                 
-                # Create optimized indexes
-                cursor.execute("CREATE INDEX idx_game_rounds_session_id ON game_rounds(session_id)")
-                cursor.execute("CREATE INDEX idx_game_rounds_player_name ON game_rounds(player_name)")
-                cursor.execute("CREATE INDEX idx_game_rounds_category ON game_rounds(category)")
-                cursor.execute("CREATE INDEX idx_game_rounds_difficulty ON game_rounds(difficulty)")
-                cursor.execute("CREATE INDEX idx_game_rounds_language ON game_rounds(language)")
-                cursor.execute("CREATE INDEX idx_game_rounds_created_at ON game_rounds(created_at)")
-                cursor.execute("CREATE INDEX idx_game_rounds_guessed_correctly ON game_rounds(guessed_correctly)")
-                cursor.execute("CREATE INDEX idx_game_rounds_game_mode ON game_rounds(game_mode)")
-                
-                # Create composite indexes for common queries
-                cursor.execute("CREATE INDEX idx_game_rounds_player_category ON game_rounds(player_name, category)")
-                cursor.execute("CREATE INDEX idx_game_rounds_player_difficulty ON game_rounds(player_name, difficulty)")
-                cursor.execute("CREATE INDEX idx_game_rounds_player_language ON game_rounds(player_name, language)")
+                # Create optimized indexes, plus composite indexes for common queries (one round trip)
+                cursor.execute("""
+                    CREATE INDEX idx_game_rounds_session_id ON game_rounds(session_id);
+                    CREATE INDEX idx_game_rounds_player_name ON game_rounds(player_name);
+                    CREATE INDEX idx_game_rounds_category ON game_rounds(category);
+                    CREATE INDEX idx_game_rounds_difficulty ON game_rounds(difficulty);
+                    CREATE INDEX idx_game_rounds_language ON game_rounds(language);
+                    CREATE INDEX idx_game_rounds_created_at ON game_rounds(created_at);
+                    CREATE INDEX idx_game_rounds_guessed_correctly ON game_rounds(guessed_correctly);
+                    CREATE INDEX idx_game_rounds_game_mode ON game_rounds(game_mode);
+                    CREATE INDEX idx_game_rounds_player_category ON game_rounds(player_name, category);
+                    CREATE INDEX idx_game_rounds_player_difficulty ON game_rounds(player_name, difficulty);
+                    CREATE INDEX idx_game_rounds_player_language ON game_rounds(player_name, language);
+                """)
                 
                 # Create trigger for updated_at
                 cursor.execute("""
@@ -514,22 +744,78 @@ class PostgreSQLHandler:
     
     def is_connected(self) -> bool:
         """Check if connection is active."""
-        # Attempt to connect on first call (lazy connection)
+        # Attempt to connect on first call (lazy connection); under the lock so concurrent
+        # first requests don't each open a connection and build their own pool
         if not self._connect_attempted:
-            self._connect_attempted = True
-            self._connect()
+            with self._reconnect_lock:
+                if not self._connect_attempted:
+                    self._connect()
+                    if not self.is_connected_flag:
+                        if os.getenv('DATABASE_URL') or os.getenv('SUPABASE_URL'):
+                            self._schedule_reconnect(time.monotonic())
+                        else:
+                            self._retry_at = float('inf')  # No database configured: nothing to retry
+                    self._connect_attempted = True
         
+        now = time.monotonic()
         if not self.is_connected_flag or not self.connection:
-            return False
+            # Circuit open: only try to reconnect once the backoff delay has passed
+            if now < self._retry_at or not self._reconnect(now):
+                return False
+            return True
+        
+        # Every query method calls this first; skip the round trip if we probed recently
+        if now - self._last_probe_ok < self._CONNECTION_CHECK_TTL:
+            return True
         
         try:
             with self.connection.cursor() as cursor:
                 cursor.execute(self._CONNECTION_TEST_SQL)
+                self._last_probe_ok = now
                 return True
         except Exception:
             self.is_connected_flag = False
+            self._schedule_reconnect(now)
             return False
     
+    def force_recheck(self):
+        """Drop the cached probe result and any reconnect delay so the next check hits the database."""
+        self._last_probe_ok = 0.0
+        self._retry_at = 0.0
+    
+    def _schedule_reconnect(self, now):
+        """Delay the next reconnect attempt, doubling the delay after each failure."""
+        self._retry_at = now + self._reconnect_backoff
+        self._reconnect_backoff = min(self._reconnect_backoff * 2, self._RECONNECT_BACKOFF_MAX)
+    
+    def _reconnect(self, now) -> bool:
+        """Re-open the bootstrap connection after a failure; the pool replaces its own broken connections."""
+        if not self._reconnect_lock.acquire(blocking=False):
+            return False  # Another thread is already reconnecting
+        try:
+            if self._conn_params is None:
+                # Never connected: go through the full setup (tables, migrations, pool)
+                self._connect()
+            else:
+                self._close_connection()
+                try:
+                    self.connection = psycopg2.connect(**self._conn_params)
+                    self.connection.autocommit = True
+                    self.is_connected_flag = self._test_connection()
+                except psycopg2.Error as e:
+                    self.logger.error(f"Failed to reconnect to PostgreSQL: {e}")
+                    self._close_connection()
+                    self.is_connected_flag = False
+            
+            if self.is_connected_flag and self.connection:
+                self._last_probe_ok = now
+                self._reconnect_backoff = self._RECONNECT_BACKOFF_MIN
+                return True
+            self._schedule_reconnect(now)
+            return False
+        finally:
+            self._reconnect_lock.release()
+    
     def save_session(self, session) -> bool:
         """Save a game session to the database."""
         if not self.is_connected() or not self.connection:
@@ -537,125 +823,44 @@ class PostgreSQLHandler:
             return False
         
         try:
-            with self.connection.cursor() as cursor:
-                # Prepare session data
-                session_data = {
-                    'rounds': []
-                }
-                
-                # Convert GameRound objects to dictionary format
-                for round_obj in session.rounds:
-                    if hasattr(round_obj, 'get'):
-                        # Already a dictionary
-                        round_data = {
-                            'word': round_obj.get('word', ''),
-                            'score': round_obj.get('score', 0),
-                            'time_taken': round_obj.get('time_taken', 0),
-                            'won': round_obj.get('won', False),
-                            'guesses': round_obj.get('guesses', [])
-                        }
-                    else:
-                        # GameRound object, convert to dictionary
-                        round_data = {
-                            'word': round_obj.item_name,
-                            'category': round_obj.category,
-                            'subcategory': round_obj.subcategory,
-                            'facts_shown': round_obj.facts_shown,
-                            'total_facts': round_obj.total_facts,
-                            'correct': round_obj.correct,
-                            'guess_attempts': round_obj.guess_attempts,
-                            'similarity_score': round_obj.similarity_score,
-                            'match_type': round_obj.match_type,
-                            'time_taken': round_obj.time_taken,
-                            'score': round_obj.round_score,
-                            'won': round_obj.correct
-                        }
-                    session_data['rounds'].append(round_data)
-                
-                # Calculate stats
-                rounds_won = sum(1 for r in session.rounds if (hasattr(r, 'correct') and r.correct) or (hasattr(r, 'get') and r.get('won', False)))
-                rounds_lost = len(session.rounds) - rounds_won
+            # The session row and its rounds are written on one connection in a single transaction
+            with self._cursor(transaction=True) as cursor:
+                # GameSession already carries the win/loss counts, so don't re-scan the rounds
+                rounds_won = session.rounds_won
+                rounds_lost = session.rounds_lost
                 
                 # Insert session
-                cursor.execute("""
-                    INSERT INTO game_sessions 
-                    (player_name, start_time, end_time, total_score, rounds_won, rounds_lost, session_data)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (
+                self._execute_prepared(cursor, 'insert_session', self._INSERT_SESSION_SQL, (
                     session.player_name,
                     session.start_time,
                     session.end_time,
                     session.total_score,
                     rounds_won,
-                    rounds_lost,
-                    psycopg2.extras.Json(session_data)
+                    rounds_lost
                 ))
                 
                 result = cursor.fetchone()
-                if result:
-                    session_id = result[0]
-                    self.logger.debug(f"Saved session {session_id} for player {session.player_name}")
-                    
-                    # Now save individual rounds to game_rounds table
-                    rounds_saved = 0
-                    for round_obj in session.rounds:
-                        round_data = {}
-                        
-                        if hasattr(round_obj, 'get'):
-                            # Already a dictionary
-                            round_data = {
-                                'player_name': session.player_name,
-                                'item_name': round_obj.get('word', ''),
-                                'category': round_obj.get('category', ''),
-                                'subcategory': round_obj.get('subcategory', ''),
-                                'difficulty': round_obj.get('difficulty', 'normal'),
-                                'language': round_obj.get('language', 'en'),
-                                'facts_revealed': round_obj.get('facts_shown', 0),
-                                'total_facts': round_obj.get('total_facts', 5),
-                                'guessed_correctly': round_obj.get('won', False),
-                                'guess_attempts': len(round_obj.get('guesses', [])),
-                                'final_guess': round_obj.get('guesses', [''])[-1] if round_obj.get('guesses') else '',
-                                'similarity_score': round_obj.get('similarity_score', 0.0),
-                                'match_type': round_obj.get('match_type', ''),
-                                'time_taken': round_obj.get('time_taken', 0.0),
-                                'round_score': round_obj.get('score', 0)
-                            }
-                        else:
-                            # GameRound object, convert to dictionary
-                            round_data = {
-                                'player_name': session.player_name,
-                                'item_name': round_obj.item_name,
-                                'category': round_obj.category,
-                                'subcategory': round_obj.subcategory,
-                                'difficulty': getattr(round_obj, 'difficulty', 'normal'),
-                                'language': getattr(round_obj, 'language', 'en'),
-                                'facts_revealed': round_obj.facts_shown,
-                                'total_facts': round_obj.total_facts,
-                                'guessed_correctly': round_obj.correct,
-                                'guess_attempts': round_obj.guess_attempts,
-                                'final_guess': getattr(round_obj, 'final_guess', ''),
-                                'similarity_score': round_obj.similarity_score,
-                                'match_type': round_obj.match_type,
-                                'time_taken': round_obj.time_taken,
-                                'round_score': round_obj.round_score
-                            }
-                        
-                        # Save this round to game_rounds table
-                        if self.save_round(session_id, round_data):
-                            rounds_saved += 1
-                    
-                    self.logger.debug(f"Saved {rounds_saved}/{len(session.rounds)} rounds to game_rounds table")
-                    
-                    # Also link any orphaned rounds (saved during gameplay) to this session
-                    orphaned_rounds_updated = self.update_rounds_with_session_id(session_id, session.player_name)
-                    if orphaned_rounds_updated > 0:
-                        self.logger.debug(f"Linked {orphaned_rounds_updated} orphaned rounds to session {session_id}")
-                    
-                    return True
-                else:
+                if not result:
                     self.logger.error("Failed to get session ID after insert")
                     return False
+                session_id = result[0]
+                
+                # One pass over the rounds builds the game_rounds payloads; the win/loss
+                # counts come from the session and there is no session_data blob to fill
+                rounds = [_as_round_dict(round_obj, session.player_name) for round_obj in session.rounds]
+                
+                # All rounds go in with one statement on the session's cursor
+                if len(rounds) >= self._COPY_MIN_ROUNDS:
+                    rounds_saved = self._copy_rounds(cursor, session_id, rounds)
+                else:
+                    rounds_saved = len(self._insert_rounds(cursor, session_id, rounds))
+            
+            self.logger.debug(f"Saved session {session_id} for player {session.player_name}")
+            self.logger.debug(f"Saved {rounds_saved}/{len(session.rounds)} rounds to game_rounds table")
+            
+            # Every round was just inserted with this session's id; linking leftover session-less
+            # rows as well would count those rounds twice in the game_rounds-based stats
+            return True
                 
         except psycopg2.Error as e:
             self.logger.error(f"Error saving session: {e}")
@@ -671,60 +876,14 @@ class PostgreSQLHandler:
             return False
         
         try:
-            with self.connection.cursor() as cursor:
-                # Extract all guesses as JSON string
-                all_guesses = round_data.get('all_guesses', [])
-                if isinstance(all_guesses, list):
-                    import json
-                    all_guesses_str = json.dumps(all_guesses) if all_guesses else None
-                else:
-                    all_guesses_str = str(all_guesses) if all_guesses else None
-                
-                cursor.execute("""
-                    INSERT INTO game_rounds 
-                    (session_id, question_id, player_name, item_name, category, subcategory, 
-                     difficulty, language, facts_revealed, total_facts, hints_used, max_hints,
-                     guessed_correctly, guess_attempts, final_guess, all_guesses, 
-                     similarity_score, match_type, time_taken, round_score, base_score, 
-                     score_multiplier, gave_up, auto_revealed, game_mode)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (
-                    session_id,
-                    question_id,
-                    round_data.get('player_name', ''),
-                    round_data.get('item_name', ''),
-                    round_data.get('category', ''),
-                    round_data.get('subcategory', ''),
-                    round_data.get('difficulty', 'normal'),
-                    round_data.get('language', 'en'),
-                    round_data.get('facts_revealed', 0),
-                    round_data.get('total_facts', 5),
-                    round_data.get('hints_used', 0),
-                    round_data.get('max_hints', 3),
-                    round_data.get('guessed_correctly', False),
-                    round_data.get('guess_attempts', 0),
-                    round_data.get('final_guess', ''),
-                    all_guesses_str,
-                    round_data.get('similarity_score', 0.0),
-                    round_data.get('match_type', ''),
-                    round_data.get('time_taken', 0.0),
-                    round_data.get('round_score', 0),
-                    round_data.get('base_score', 0),
-                    round_data.get('score_multiplier', 1.0),
-                    round_data.get('gave_up', False),
-                    round_data.get('auto_revealed', False),
-                    round_data.get('game_mode', 'online')
-                ))
-                
-                result = cursor.fetchone()
-                if result:
-                    round_id = result[0]
-                    self.logger.debug(f"Saved enhanced round {round_id} for session {session_id}")
-                    return True
-                else:
-                    self.logger.error("Failed to get round ID after insert")
-                    return False
+            with self._cursor() as cursor:
+                round_ids = self._insert_rounds(cursor, session_id, [round_data], question_id)
+            if round_ids:
+                self.logger.debug(f"Saved enhanced round {round_ids[0]} for session {session_id}")
+                return True
+            else:
+                self.logger.error("Failed to get round ID after insert")
+                return False
                 
         except psycopg2.Error as e:
             self.logger.error(f"Error saving round: {e}")
@@ -733,6 +892,130 @@ class PostgreSQLHandler:
             self.logger.error(f"Unexpected error saving round: {e}")
             return False
     
+    def _insert_rounds(self, cursor, session_id: Optional[int], rounds: List[Dict],
+                       question_id: Optional[int] = None) -> List[int]:
+        """Insert game_rounds rows on the given cursor with one multi-row INSERT and return their ids."""
+        rows = [self._round_row(session_id, round_data, question_id) for round_data in rounds]
+        if not rows:
+            return []
+        if len(rows) == 1:
+            # Single rounds (save_round, one-round sessions) reuse the prepared INSERT
+            self._execute_prepared(cursor, 'insert_round', self._INSERT_ROUND_SQL, rows[0])
+            result = cursor.fetchone()
+            return [result[0]] if result else []
+        
+        result = psycopg2.extras.execute_values(cursor, """
+            INSERT INTO game_rounds 
+            (session_id, question_id, player_name, item_name, category, subcategory, 
+             difficulty, language, facts_revealed, total_facts, hints_used, max_hints,
+             guessed_correctly, guess_attempts, final_guess, all_guesses, 
+             similarity_score, match_type, time_taken, round_score, base_score, 
+             score_multiplier, gave_up, auto_revealed, game_mode)
+            VALUES %s
+            RETURNING id
+        """, rows, page_size=200, fetch=True)
+        return [row[0] for row in result]
+    
+    def save_rounds_bulk(self, session_id: Optional[int], rounds: List[Dict]) -> int:
+        """Save many rounds with COPY (imports, replays); returns the number of rows written."""
+        if not self.is_connected() or not self.connection:
+            self.logger.warning("Not connected to database, cannot save rounds")
+            return 0
+        
+        try:
+            with self._cursor() as cursor:
+                return self._copy_rounds(cursor, session_id, rounds)
+                
+        except psycopg2.Error as e:
+            self.logger.error(f"Error bulk saving rounds: {e}")
+            return 0
+        except Exception as e:
+            self.logger.error(f"Unexpected error bulk saving rounds: {e}")
+            return 0
+    
+    def _copy_rounds(self, cursor, session_id: Optional[int], rounds: List[Dict]) -> int:
+        """Stream game_rounds rows through COPY FROM STDIN, skipping per-row parse/plan work."""
+        if not rounds:
+            return 0
+        
+        # COPY text format: tab-separated, \N for NULL, backslash escapes inside values
+        buffer = io.StringIO()
+        for round_data in rounds:
+            buffer.write('\t'.join(self._copy_value(value)
+                                   for value in self._round_row(session_id, round_data)))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        cursor.copy_expert(f"COPY game_rounds ({', '.join(self._ROUND_COLUMNS)}) FROM STDIN", buffer)
+        return cursor.rowcount
+    
+    @staticmethod
+    def _copy_value(value) -> str:
+        """Encode one value for COPY's text format."""
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+    
+    def _execute_prepared(self, cursor, name: str, sql: str, params: tuple):
+        """Execute sql through a statement PREPAREd once per connection, so the server skips parse/plan."""
+        if not self._use_prepared or not self._pool:
+            # Without a pool the cursor is on the shared bootstrap connection (or a one-off
+            # transaction connection), where two threads could both PREPARE the same name
+            cursor.execute(sql, params)
+            return
+        
+        # A pooled connection is used by one thread at a time, so check-then-PREPARE can't race
+        with self._prepared_lock:
+            prepared = self._prepared.setdefault(cursor.connection, set())
+        if name not in prepared:
+            # $1..$n placeholders in place of %s; parameter types are inferred from the target columns
+            parts = sql.split('%s')
+            positional = parts[0] + ''.join(f"${i}{part}" for i, part in enumerate(parts[1:], 1))
+            cursor.execute(f"PREPARE {name} AS {positional}")
+            prepared.add(name)  # PREPARE isn't transactional, so this survives a later rollback
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    
+    def _round_row(self, session_id: Optional[int], round_data: Dict, question_id: Optional[int] = None) -> tuple:
+        """Build the game_rounds column values for one round."""
+        # Extract all guesses as JSON string
+        all_guesses = round_data.get('all_guesses', [])
+        if isinstance(all_guesses, list):
+            import json
+            all_guesses_str = json.dumps(all_guesses) if all_guesses else None
+        else:
+            all_guesses_str = str(all_guesses) if all_guesses else None
+        
+        return (
+            session_id,
+            question_id if question_id is not None else round_data.get('question_id'),
+            round_data.get('player_name', ''),
+            round_data.get('item_name', ''),
+            round_data.get('category', ''),
+            round_data.get('subcategory', ''),
+            round_data.get('difficulty', 'normal'),
+            round_data.get('language', 'en'),
+            round_data.get('facts_revealed', 0),
+            round_data.get('total_facts', 5),
+            round_data.get('hints_used', 0),
+            round_data.get('max_hints', 3),
+            round_data.get('guessed_correctly', False),
+            round_data.get('guess_attempts', 0),
+            round_data.get('final_guess', ''),
+            all_guesses_str,
+            round_data.get('similarity_score', 0.0),
+            round_data.get('match_type', ''),
+            round_data.get('time_taken', 0.0),
+            round_data.get('round_score', 0),
+            round_data.get('base_score', 0),
+            round_data.get('score_multiplier', 1.0),
+            round_data.get('gave_up', False),
+            round_data.get('auto_revealed', False),
+            round_data.get('game_mode', 'online')
+        )
+    
     def update_rounds_with_session_id(self, session_id: int, player_name: str) -> int:
         """Update rounds without session_id to link them to a completed session."""
         if not self.is_connected() or not self.connection:
@@ -740,7 +1023,7 @@ class PostgreSQLHandler:
             return 0
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 # Update rounds that don't have a session_id but match the player
                 cursor.execute("""
                     UPDATE game_rounds 
@@ -748,7 +1031,6 @@ class PostgreSQLHandler:
                     WHERE session_id IS NULL 
                     AND player_name = %s 
                     AND created_at >= NOW() - INTERVAL '1 hour'
-                    ORDER BY created_at DESC
                 """, (session_id, player_name))
                 
                 updated_count = cursor.rowcount
@@ -768,7 +1050,7 @@ class PostgreSQLHandler:
             return {}
         
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 # Get comprehensive round statistics with new fields
                 cursor.execute("""
                     SELECT 
@@ -887,7 +1169,7 @@ class PostgreSQLHandler:
             return []
         
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 if player_name:
                     cursor.execute("""
                         SELECT * FROM game_rounds 
@@ -917,10 +1199,10 @@ class PostgreSQLHandler:
             return []
         
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
-                    SELECT player_name, start_time, end_time, total_score, 
-                           rounds_won, rounds_lost, session_data
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"""
+                    SELECT player_name, start_time, end_time, total_score,
+                           rounds_won, rounds_lost, {self._DATE_STR_COLUMN}, {self._AVG_TIME_COLUMN}
                     FROM game_sessions
                     ORDER BY total_score DESC, start_time DESC
                     LIMIT %s
@@ -939,10 +1221,10 @@ class PostgreSQLHandler:
             return []
         
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"""
                     SELECT player_name, start_time, end_time, total_score,
-                           rounds_won, rounds_lost, session_data
+                           rounds_won, rounds_lost, {self._DATE_STR_COLUMN}, {self._AVG_TIME_COLUMN}
                     FROM game_sessions
                     WHERE player_name = %s
                     ORDER BY start_time DESC
@@ -962,7 +1244,7 @@ class PostgreSQLHandler:
             return {}
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 basic_stats = self._get_basic_stats(cursor)
                 
                 if not basic_stats or basic_stats[0] is None:
@@ -983,6 +1265,66 @@ class PostgreSQLHandler:
             self.logger.error(f"Error getting global stats: {e}")
             return {}
     
+    def get_top_sessions_and_stats(self, limit: int = 10) -> Tuple[List[Dict], Dict]:
+        """Get the top scoring sessions and the global statistics in a single query.
+        
+        Returns the same (sessions, stats) pair as get_top_sessions() and get_global_stats(),
+        with the per-round best score and fastest time aggregated by PostgreSQL.
+        """
+        if not self.is_connected() or not self.connection:
+            return [], {}
+        
+        try:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"""
+                    WITH stats AS (
+                        SELECT MAX(total_score) AS best_session_score,
+                               SUM(rounds_won) AS total_wins,
+                               SUM(rounds_won + rounds_lost) AS total_games,
+                               COUNT(*) AS total_sessions
+                        FROM game_sessions
+                    ), round_stats AS (
+                        SELECT MAX(round_score) AS best_round_score,
+                               MIN(time_taken)::float8 AS fastest_round
+                        FROM game_rounds
+                        WHERE session_id IS NOT NULL
+                    ), top AS (
+                        SELECT player_name, start_time, end_time, total_score,
+                               rounds_won, rounds_lost, {self._DATE_STR_COLUMN}, {self._AVG_TIME_COLUMN}
+                        FROM game_sessions
+                        ORDER BY total_score DESC, start_time DESC
+                        LIMIT %s
+                    )
+                    SELECT top.*, stats.*, round_stats.*
+                    FROM stats
+                    CROSS JOIN round_stats
+                    LEFT JOIN top ON TRUE
+                    ORDER BY top.total_score DESC, top.start_time DESC
+                """, (limit,))
+                rows = cursor.fetchall()
+        except psycopg2.Error as e:
+            self.logger.error(f"Error getting top sessions and stats: {e}")
+            return [], {}
+        
+        if not rows or rows[0]['best_session_score'] is None:
+            return [], {}
+        
+        first = rows[0]
+        top_sessions = [
+            {key: row[key] for key in ('player_name', 'start_time', 'end_time', 'total_score',
+                                       'rounds_won', 'rounds_lost', 'date_str', 'avg_time')}
+            for row in rows
+        ]
+        global_stats = {
+            'best_session_score': first['best_session_score'] or 0,
+            'best_round_score': max(first['best_round_score'] or 0, 0),
+            'fastest_round': first['fastest_round'] if first['fastest_round'] is not None else 0,
+            'total_wins': first['total_wins'] or 0,
+            'total_games': first['total_games'] or 0,
+            'total_sessions': first['total_sessions'] or 0
+        }
+        return top_sessions, global_stats
+    
     def _get_basic_stats(self, cursor):
         """Get basic statistics from the database."""
         cursor.execute("""
@@ -996,45 +1338,44 @@ class PostgreSQLHandler:
         return cursor.fetchone()
     
     def _get_best_round_stats(self, cursor):
-        """Get best round statistics from session data."""
+        """Get best round score and fastest round time across saved sessions' rounds."""
         cursor.execute("""
-            SELECT session_data
-            FROM game_sessions
-            WHERE session_data IS NOT NULL
+            SELECT MAX(round_score), MIN(time_taken)::float8
+            FROM game_rounds
+            WHERE session_id IS NOT NULL
         """)
+        best_round_score, fastest_round = cursor.fetchone()
         
-        best_round_score = 0
-        fastest_round = float('inf')
-        
-        for row in cursor.fetchall():
-            session_data = row[0]
-            if session_data and 'rounds' in session_data:
-                round_best_score, round_fastest_time = self._process_round_data(session_data['rounds'])
-                best_round_score = max(best_round_score, round_best_score)
-                fastest_round = min(fastest_round, round_fastest_time)
-        
+        best_round_score = max(best_round_score or 0, 0)
+        fastest_round = fastest_round if fastest_round is not None else float('inf')
         return best_round_score, fastest_round
     
-    def _process_round_data(self, rounds):
-        """Process individual round data to find best score and fastest time."""
-        best_score = 0
-        fastest_time = float('inf')
-        
-        for round_data in rounds:
-            # Best round score
-            round_score = round_data.get('score', 0)
-            if round_score > best_score:
-                best_score = round_score
-            
-            # Fastest round
-            time_taken = round_data.get('time_taken', float('inf'))
-            if time_taken < fastest_time:
-                fastest_time = time_taken
+    def get_session_rounds(self, session_id: int) -> List[Dict]:
+        """Get the rounds of a saved session, in the order they were played."""
+        if not self.is_connected() or not self.connection:
+            return []
         
-        return best_score, fastest_time
+        try:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT * FROM game_rounds
+                    WHERE session_id = %s
+                    ORDER BY id
+                """, (session_id,))
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except psycopg2.Error as e:
+            self.logger.error(f"Error getting session rounds: {e}")
+            return []
     
     def close(self):
         """Close database connection."""
+        if self._pool:
+            try:
+                self._pool.closeall()
+            except Exception:
+                pass
+            self._pool = None
         if self.connection:
             try:
                 self.connection.close()
@@ -1042,6 +1383,7 @@ class PostgreSQLHandler:
             except Exception:
                 pass
         self.is_connected_flag = False
+        self._retry_at = float('inf')  # Closed on purpose: don't reconnect
 
     def check_item_exists(self, item_name: str, category: Optional[str] = None, language: Optional[str] = None, time_window_hours: int = 24) -> bool:
         """Check if an item was recently generated to prevent duplicates."""
@@ -1049,7 +1391,7 @@ class PostgreSQLHandler:
             return False
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 # Simple query without parameterized intervals to avoid SQL syntax issues
                 base_query = "SELECT COUNT(*) FROM generated_questions WHERE LOWER(item_name) = LOWER(%s)"
                 params = [item_name]
@@ -1087,7 +1429,7 @@ class PostgreSQLHandler:
             return []
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 base_query = """
                     SELECT item_name 
                     FROM generated_questions 
@@ -1136,7 +1478,7 @@ class PostgreSQLHandler:
             return None
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 # Insert question data using correct column names
                 cursor.execute("""
                     INSERT INTO generated_questions (
@@ -1199,7 +1541,7 @@ class PostgreSQLHandler:
             return []
         
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 # Build query based on filters
                 base_query = """
                     SELECT 
@@ -1263,7 +1605,7 @@ class PostgreSQLHandler:
             return None
         
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 # Build query with random selection
                 base_query = """
                     SELECT 
@@ -1313,13 +1655,119 @@ class PostgreSQLHandler:
             self.logger.error(f"Error retrieving random offline question: {e}")
             return None
 
+    def pick_and_mark_offline_question(self, 
+                                       category: Optional[str] = None, 
+                                       difficulty: Optional[str] = None,
+                                       language: str = 'en') -> Optional[Dict]:
+        """
+        Pick a random unused offline question and mark it as used in one statement.
+        """
+        if not self.is_connected() or not self.connection:
+            return None
+        
+        try:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
+                where_conditions = ["language = %s", "used_in_round = FALSE"]
+                params: List[Any] = [language]
+                
+                if category:
+                    where_conditions.append("LOWER(category) = LOWER(%s)")
+                    params.append(category)
+                
+                if difficulty:
+                    where_conditions.append("LOWER(difficulty) = LOWER(%s)")
+                    params.append(difficulty)
+                
+                where_clause = " AND ".join(where_conditions)
+                
+                # SKIP LOCKED keeps two concurrent games from claiming the same question
+                cursor.execute(f"""
+                    WITH picked AS (
+                        SELECT id FROM generated_questions
+                        WHERE {where_clause}
+                        ORDER BY RANDOM() LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE generated_questions q
+                    SET used_in_round = TRUE, updated_at = NOW()
+                    FROM picked
+                    WHERE q.id = picked.id
+                    RETURNING q.id, q.item_name, q.category, q.subcategory, q.difficulty,
+                              q.facts, q.language, q.created_at
+                """, params)
+                question = cursor.fetchone()
+                
+                if not question:
+                    self.logger.warning(f"No offline questions found for category={category}, difficulty={difficulty}")
+                    return None
+                
+                question_dict = dict(question)
+                # Ensure facts is a list
+                if isinstance(question_dict.get('facts'), str):
+                    import json
+                    try:
+                        question_dict['facts'] = json.loads(question_dict['facts'])
+                    except (json.JSONDecodeError, TypeError):
+                        question_dict['facts'] = []
+                elif not isinstance(question_dict.get('facts'), list):
+                    question_dict['facts'] = []
+                self.logger.info(f"Picked offline question: {question_dict['item_name']}")
+                return question_dict
+                
+        except psycopg2.Error as e:
+            self.logger.error(f"Error picking offline question: {e}")
+            return None
+
+    def get_random_question_for_category(self, category: str, language: str = 'en') -> Optional[Dict]:
+        """
+        Get a single random question for a category and language.
+        
+        Seeks to the first random_key at or after a random point (wrapping around to the
+        lowest key), so the category/language/random_key index returns one row without
+        counting or sorting the category slice.
+        """
+        if not self.is_connected() or not self.connection:
+            return None
+        
+        try:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    WITH pick AS (SELECT random() AS key)
+                    (
+                        SELECT item_name, facts, category, subcategory
+                        FROM generated_questions, pick
+                        WHERE LOWER(category) = LOWER(%s) 
+                        AND language = %s 
+                        AND random_key >= pick.key
+                        ORDER BY random_key
+                        LIMIT 1
+                    )
+                    UNION ALL
+                    (
+                        SELECT item_name, facts, category, subcategory
+                        FROM generated_questions
+                        WHERE LOWER(category) = LOWER(%s) 
+                        AND language = %s 
+                        ORDER BY random_key
+                        LIMIT 1
+                    )
+                    LIMIT 1
+                """, (category, language, category, language))
+                
+                result = cursor.fetchone()
+                return dict(result) if result else None
+                
+        except psycopg2.Error as e:
+            self.logger.error(f"Error getting random question for category: {e}")
+            return None
+
     def mark_question_as_used(self, question_id: int) -> bool:
         """Mark a question as used in a round."""
         if not self.is_connected() or not self.connection:
             return False
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute("""
                     UPDATE generated_questions 
                     SET used_in_round = TRUE, updated_at = NOW()
@@ -1344,7 +1792,7 @@ class PostgreSQLHandler:
         
         assert self.connection is not None  # Type hint for type checker
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 # Build query with optional filters
                 where_conditions = ["language = %s"]
                 params: List[Any] = [language]
@@ -1377,6 +1825,46 @@ class PostgreSQLHandler:
             self.logger.error(f"Error counting offline questions: {e}")
             return 0
 
+    def get_offline_question_counts(self, category: Optional[str] = None, 
+                                    difficulty: Optional[str] = None, 
+                                    language: str = 'en') -> Tuple[int, int]:
+        """Get (total, unused) offline question counts in a single query."""
+        if not self.is_connected():
+            self.logger.warning("Not connected to database, cannot count offline questions")
+            return 0, 0
+        
+        try:
+            with self._cursor() as cursor:
+                # Build query with optional filters
+                where_conditions = ["language = %s"]
+                params: List[Any] = [language]
+                
+                if category:
+                    # Case-insensitive comparison for category
+                    where_conditions.append("LOWER(category) = LOWER(%s)")
+                    params.append(category)
+                
+                if difficulty:
+                    # Case-insensitive comparison for difficulty
+                    where_conditions.append("LOWER(difficulty) = LOWER(%s)")
+                    params.append(difficulty)
+                
+                where_clause = " AND ".join(where_conditions)
+                
+                cursor.execute(f"""
+                    SELECT COUNT(*),
+                           COUNT(*) FILTER (WHERE used_in_round IS FALSE OR used_in_round IS NULL)
+                    FROM generated_questions 
+                    WHERE {where_clause}
+                """, params)
+                
+                result = cursor.fetchone()
+                return (result[0], result[1]) if result else (0, 0)
+                
+        except psycopg2.Error as e:
+            self.logger.error(f"Error counting offline questions: {e}")
+            return 0, 0
+
     def get_random_question(self, category: Optional[str] = None, difficulty: Optional[str] = None, 
                            language: str = 'en', exclude_recent_hours: int = 24) -> Optional[Dict]:
         """Get a random question from the database for offline mode."""
@@ -1386,7 +1874,7 @@ class PostgreSQLHandler:
         
         assert self.connection is not None  # Type hint for type checker
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 # Build query with optional filters
                 where_conditions = ["language = %s"]
                 params: List[Any] = [language]
@@ -1433,7 +1921,7 @@ class PostgreSQLHandler:
         
         assert self.connection is not None  # Type hint for type checker
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
                     SELECT id, item_name, category, subcategory, difficulty, 
                            facts, language, created_at, used_in_round
@@ -1458,7 +1946,7 @@ class PostgreSQLHandler:
         
         assert self.connection is not None  # Type hint for type checker
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
                     SELECT category, COUNT(*) as question_count,
                            COUNT(DISTINCT difficulty) as difficulty_count,
@@ -1485,14 +1973,13 @@ class PostgreSQLHandler:
         
         assert self.connection is not None  # Type hint for type checker
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute("""
                     UPDATE generated_questions 
                     SET used_in_round = TRUE, updated_at = NOW()
                     WHERE id = %s
                 """, (question_id,))
                 
-                self.connection.commit()
                 return cursor.rowcount > 0
                 
         except psycopg2.Error as e:
@@ -1506,7 +1993,7 @@ class PostgreSQLHandler:
         
         assert self.connection is not None  # Type hint for type checker
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
                     SELECT 
                         COUNT(*) as total_questions,
@@ -22,6 +22,10 @@ class GameRound:
     time_taken: float  # Time in seconds for the round
     round_score: int  # Points scored for this round
     hints_used: int = 0  # Number of letter hints used
+    difficulty: str = "normal"
+    language: str = "en"
+    final_guess: str = ""
+    question_id: Optional[int] = None  # generated_questions row the item came from, if any
 
 @dataclass
 class GameSession:
@@ -390,20 +394,23 @@ class ScoreKeeper:
     
     def _get_top_sessions_display(self, sorted_sessions: List[Dict], is_polish: bool, lang_manager: Any) -> str:
         """Get display text for top sessions"""
-        display = ""
+        # Translated rows use the template cached by the language manager
+        render_row = lang_manager.render_session_details if is_polish and lang_manager else None
+        rows = []
         for i, session in enumerate(sorted_sessions, 1):
-            date_str = session["date"][:10] if len(session["date"]) > 10 else session["date"]
+            date_str = session["date"][:10]
             player_name = session.get("player_name", "Anonymous Player")
             
-            if is_polish and lang_manager:
-                session_data = session.copy()
-                session_data['date'] = date_str
-                session_data['player_name'] = player_name
-                display += f"   {i:2d}. {lang_manager.get_text('session_details').format(**session_data)}\n"
+            score, wins, rounds, grade = session['score'], session['wins'], session['rounds'], session['grade']
+            
+            if render_row:
+                row = render_row({'date': date_str, 'player_name': player_name, 'score': score,
+                                  'wins': wins, 'rounds': rounds, 'grade': grade})
+                rows.append(f"   {i:2d}. {row}\n")
             else:
-                display += f"   {i:2d}. 📅 {date_str} | 👤 {player_name} | 🎯 {session['score']:,} pts | 📊 {session['wins']}/{session['rounds']} wins | 🏆 Grade {session['grade']}\n"
+                rows.append(f"   {i:2d}. 📅 {date_str} | 👤 {player_name} | 🎯 {score:,} pts | 📊 {wins}/{rounds} wins | 🏆 Grade {grade}\n")
         
-        return display
+        return "".join(rows)
     
     def _get_personal_records_display(self, is_polish: bool) -> str:
         """Get personal records display text"""